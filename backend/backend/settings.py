@@ -169,3 +169,26 @@ STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
+
+# Scheduler
+# Stratégia hľadania skupín pre úlohy s viacerými ľuďmi ('branch_and_bound', 'numpy' alebo referenčná 'exhaustive')
+SCHEDULER_SEARCH_STRATEGY = os.getenv('SCHEDULER_SEARCH_STRATEGY', 'branch_and_bound')
+# Režim generovania: 'greedy' priraďuje úlohy po jednej, 'slot' rieši celý časový slot naraz
+SCHEDULER_ENGINE_MODE = os.getenv('SCHEDULER_ENGINE_MODE', 'greedy')
+# Počet súbežných procesov workera pre generovanie rozvrhov na pozadí
+SCHEDULER_WORKER_CONCURRENCY = int(os.getenv('SCHEDULER_WORKER_CONCURRENCY', '1'))
+# Po koľkých sekundách sa generovanie v stave running považuje za zlyhané (worker zomrel)
+SCHEDULER_JOB_TIMEOUT = int(os.getenv('SCHEDULER_JOB_TIMEOUT', str(30 * 60)))
+
+# Cache
+# Súborová cache je spoločná pre všetky procesy gunicornu v kontajneri,
+# takže návrh rozvrhu z jedného procesu vie potvrdiť aj iný proces
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.getenv('DJANGO_CACHE_DIR', '/tmp/sdb_worker_cache'),
+    }
+}
+# Ako dlho (v sekundách) zostanú v cache odpovede čítaní tímu; kľúč obsahuje
+# verziu tímu a zápisy ich zneplatňujú, takže dlhší čas nevracia staré dáta
+TEAM_RESPONSE_CACHE_TIMEOUT = int(os.getenv('TEAM_RESPONSE_CACHE_TIMEOUT', str(24 * 60 * 60)))
@@ -1,30 +1,71 @@
 from django.contrib import admin
-from .models import Team, TeamMember, Task, TaskSchedule
+from .models import Team, TeamMember, Task, TaskSchedule, ScheduleJob
+from .counters import rebuild_team_counters
+from .response_cache import team_changed
+
+class TeamChangedMixin:
+    """Úpravy a mazanie v administrácii zvýšia verziu tímu a zneplatnia
+    jeho odpovede v cache, rovnako ako zápisy cez API"""
+    
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        team_changed(obj.team)
+    
+    def delete_model(self, request, obj):
+        team = obj.team
+        super().delete_model(request, obj)
+        team_changed(team)
+    
+    def delete_queryset(self, request, queryset):
+        teams = list(Team.objects.filter(id__in=queryset.values('team_id')))
+        super().delete_queryset(request, queryset)
+        for team in teams:
+            team_changed(team)
+
+class RebuildCountersOnDeleteMixin:
+    """Mazanie v administrácii kaskádovo maže rozvrhy alebo ich členov,
+    počítadlá dotknutých tímov sa preto prepočítajú z histórie"""
+    
+    def delete_model(self, request, obj):
+        team = obj.team
+        super().delete_model(request, obj)
+        rebuild_team_counters(team)
+    
+    def delete_queryset(self, request, queryset):
+        teams = list(Team.objects.filter(id__in=queryset.values('team_id')))
+        super().delete_queryset(request, queryset)
+        for team in teams:
+            rebuild_team_counters(team)
 
 @admin.register(Team)
 class TeamAdmin(admin.ModelAdmin):
     list_display = ['name', 'team_password', 'admin_password', 'created_at', 'member_count']
     search_fields = ['name']
-    readonly_fields = ['team_password', 'admin_password', 'created_at', 'updated_at']
+    readonly_fields = ['team_password', 'admin_password', 'created_at', 'updated_at', 'version', 'counters_built']
+    
+    # Zmazaný tím sa už cez heslo nenájde, jeho odpovede v cache len vypršia
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        team_changed(obj)
     
     def member_count(self, obj):
         return obj.members.count()
     member_count.short_description = "Počet členov"
 
 @admin.register(TeamMember)
-class TeamMemberAdmin(admin.ModelAdmin):
+class TeamMemberAdmin(TeamChangedMixin, RebuildCountersOnDeleteMixin, admin.ModelAdmin):
     list_display = ['name', 'team', 'created_at']
     list_filter = ['team']
     search_fields = ['name', 'team__name']
 
 @admin.register(Task)
-class TaskAdmin(admin.ModelAdmin):
+class TaskAdmin(TeamChangedMixin, RebuildCountersOnDeleteMixin, admin.ModelAdmin):
     list_display = ['name', 'team', 'people_needed', 'created_at']
     list_filter = ['team', 'people_needed']
     search_fields = ['name', 'team__name', 'description']
 
 @admin.register(TaskSchedule)
-class TaskScheduleAdmin(admin.ModelAdmin):
+class TaskScheduleAdmin(TeamChangedMixin, RebuildCountersOnDeleteMixin, admin.ModelAdmin):
     list_display = ['task', 'team', 'date', 'members_display', 'created_at']
     list_filter = ['team', 'date', 'task']
     search_fields = ['task__name', 'team__name']
@@ -33,3 +74,14 @@ class TaskScheduleAdmin(admin.ModelAdmin):
     def members_display(self, obj):
         return ", ".join([member.name for member in obj.members.all()])
     members_display.short_description = "Členovia"
+    
+    # Ručné úpravy rozvrhov v administrácii prepočítajú počítadlá tímu
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        rebuild_team_counters(form.instance.team)
+
+@admin.register(ScheduleJob)
+class ScheduleJobAdmin(admin.ModelAdmin):
+    list_display = ['team', 'date_from', 'date_to', 'mode', 'status', 'created_at', 'finished_at']
+    list_filter = ['status', 'team']
+    readonly_fields = ['created_at', 'started_at', 'finished_at']
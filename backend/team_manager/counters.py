@@ -0,0 +1,175 @@
+from collections import Counter
+
+from django.db import transaction
+
+from .models import Team, TaskSchedule, MemberCounter, MemberTaskCounter, MemberPairCounter
+
+
+def lock_team(team):
+    """Zamkne riadok tímu do konca transakcie, zápisy rozvrhov tímu tak idú po jednom"""
+    return Team.objects.select_for_update().filter(pk=team.pk).first()
+
+
+def load_schedule_groups(schedules):
+    """Načíta dvojice (task_id, member_ids) pre queryset rozvrhov dvoma dotazmi"""
+    schedule_tasks = dict(schedules.values_list('id', 'task_id'))
+    schedule_members = {schedule_id: [] for schedule_id in schedule_tasks}
+
+    # Členov všetkých rozvrhov načítaj jedným dotazom cez prepojovaciu tabuľku
+    member_rows = TaskSchedule.members.through.objects.filter(
+        taskschedule__in=schedules.values('id')
+    ).values_list('taskschedule_id', 'teammember_id')
+    for schedule_id, member_id in member_rows:
+        if schedule_id in schedule_members:
+            schedule_members[schedule_id].append(member_id)
+
+    return [(schedule_tasks[schedule_id], member_ids) for schedule_id, member_ids in schedule_members.items()]
+
+
+def count_schedule_groups(schedule_groups):
+    """Spočíta príspevky rozvrhov k počítadlám: úlohy členov, úlohy podľa úloh a dvojice"""
+    member_totals = Counter()
+    member_task_totals = Counter()
+    pair_totals = Counter()
+    for task_id, member_ids in schedule_groups:
+        member_ids = sorted(member_ids)
+        for member_id in member_ids:
+            member_totals[member_id] += 1
+            member_task_totals[(member_id, task_id)] += 1
+        for i in range(len(member_ids)):
+            for j in range(i+1, len(member_ids)):
+                pair_totals[(member_ids[i], member_ids[j])] += 1
+    return member_totals, member_task_totals, pair_totals
+
+
+@transaction.atomic
+def apply_schedule_counts(team, schedule_groups, sign=1):
+    """Pripočíta (sign=1) alebo odpočíta (sign=-1) rozvrhy k počítadlám tímu
+
+    Volá sa pred zápisom rozvrhov do databázy (pred vložením aj pred
+    vymazaním). Počítadlá sa menia v jednej transakcii a pod zámkom tímu,
+    aby sa súbežné generovania neprepísali navzájom. Tím, ktorý počítadlá
+    ešte nemá zostavené, si ich pod tým istým zámkom najprv zostaví
+    z aktuálnej histórie, inak by zmena vytvorila neúplné počítadlá.
+    """
+    member_totals, member_task_totals, pair_totals = count_schedule_groups(schedule_groups)
+    if not member_totals:
+        return
+
+    if not lock_team(team).counters_built:
+        rebuild_team_counters(team)
+
+    _apply_deltas(
+        MemberCounter, 'task_count',
+        MemberCounter.objects.filter(team=team, member_id__in=member_totals),
+        lambda counter: counter.member_id,
+        lambda member_id: MemberCounter(team=team, member_id=member_id),
+        member_totals, sign
+    )
+    _apply_deltas(
+        MemberTaskCounter, 'count',
+        MemberTaskCounter.objects.filter(team=team, member_id__in=member_totals),
+        lambda counter: (counter.member_id, counter.task_id),
+        lambda key: MemberTaskCounter(team=team, member_id=key[0], task_id=key[1]),
+        member_task_totals, sign
+    )
+    _apply_deltas(
+        MemberPairCounter, 'count',
+        MemberPairCounter.objects.filter(team=team, member_low_id__in=member_totals, member_high_id__in=member_totals),
+        lambda counter: (counter.member_low_id, counter.member_high_id),
+        lambda key: MemberPairCounter(team=team, member_low_id=key[0], member_high_id=key[1]),
+        pair_totals, sign
+    )
+
+
+def _apply_deltas(model, field, existing, key_of, create, deltas, sign):
+    """Zapíše zmeny počítadiel jedným bulk_update a jedným bulk_create
+
+    Záporný výsledok znamená, že počítadlá nezodpovedajú histórii - vtedy
+    vyhodí ValueError a transakcia sa vráti, namiesto tichého orezania na nulu.
+    """
+    existing_by_key = {key_of(counter): counter for counter in existing}
+    to_update = []
+    to_create = []
+    for key, delta in deltas.items():
+        counter = existing_by_key.get(key)
+        if counter is None:
+            counter = create(key)
+            to_create.append(counter)
+        else:
+            to_update.append(counter)
+        value = getattr(counter, field) + sign * delta
+        if value < 0:
+            raise ValueError('Počítadlá tímu nezodpovedajú histórii rozvrhov, spustite príkaz rebuild_counters')
+        setattr(counter, field, value)
+
+    if to_update:
+        model.objects.bulk_update(to_update, [field])
+    if to_create:
+        model.objects.bulk_create(to_create)
+
+
+@transaction.atomic
+def rebuild_team_counters(team):
+    """Prepočíta počítadlá tímu od nuly z celej histórie rozvrhov"""
+    lock_team(team)
+
+    MemberCounter.objects.filter(team=team).delete()
+    MemberTaskCounter.objects.filter(team=team).delete()
+    MemberPairCounter.objects.filter(team=team).delete()
+
+    member_totals, member_task_totals, pair_totals = count_schedule_groups(
+        load_schedule_groups(TaskSchedule.objects.filter(team=team))
+    )
+
+    # Počítadlo celkového počtu úloh má každý člen, aj ten bez úloh
+    member_ids = team.members.values_list('id', flat=True)
+    MemberCounter.objects.bulk_create([
+        MemberCounter(team=team, member_id=member_id, task_count=member_totals.get(member_id, 0))
+        for member_id in member_ids
+    ])
+    MemberTaskCounter.objects.bulk_create([
+        MemberTaskCounter(team=team, member_id=member_id, task_id=task_id, count=count)
+        for (member_id, task_id), count in member_task_totals.items()
+    ])
+    MemberPairCounter.objects.bulk_create([
+        MemberPairCounter(team=team, member_low_id=low_id, member_high_id=high_id, count=count)
+        for (low_id, high_id), count in pair_totals.items()
+    ])
+    Team.objects.filter(pk=team.pk).update(counters_built=True)
+
+
+def ensure_team_counters(team):
+    """Zostaví počítadlá tímu, ak ešte neboli zostavené z jeho histórie"""
+    if not Team.objects.filter(pk=team.pk, counters_built=True).exists():
+        rebuild_team_counters(team)
+
+
+def load_team_counters(team, before_date):
+    """Načíta počítadlá tímu platné pre rozvrhy pred daným dátumom
+
+    Počítadlá obsahujú celú históriu, preto sa od nich odpočítajú rozvrhy
+    od daného dátumu ďalej (zvyčajne len niekoľko dní dopredu).
+    Vráti (member_totals, member_task_totals, pair_totals).
+    """
+    ensure_team_counters(team)
+
+    member_totals = Counter(dict(
+        MemberCounter.objects.filter(team=team).values_list('member_id', 'task_count')
+    ))
+    member_task_totals = Counter({
+        (member_id, task_id): count
+        for member_id, task_id, count in MemberTaskCounter.objects.filter(team=team).values_list('member_id', 'task_id', 'count')
+    })
+    pair_totals = Counter({
+        (low_id, high_id): count
+        for low_id, high_id, count in MemberPairCounter.objects.filter(team=team).values_list('member_low_id', 'member_high_id', 'count')
+    })
+
+    later_totals = count_schedule_groups(
+        load_schedule_groups(TaskSchedule.objects.filter(team=team, date__gte=before_date))
+    )
+    for totals, later in zip((member_totals, member_task_totals, pair_totals), later_totals):
+        totals.subtract(later)
+
+    return member_totals, member_task_totals, pair_totals
@@ -0,0 +1,130 @@
+import csv
+import itertools
+import json
+
+from django.utils import timezone
+
+from .models import TaskSchedule
+
+# Koľko riadkov si databázový kurzor načíta naraz
+EXPORT_CHUNK_SIZE = 2000
+
+# Formát -> (content type, prípona súboru)
+EXPORT_FORMATS = {
+    'csv': ('text/csv; charset=utf-8', 'csv'),
+    'ics': ('text/calendar; charset=utf-8', 'ics'),
+    'ndjson': ('application/x-ndjson', 'ndjson'),
+}
+
+CSV_HEADER = ['date', 'time_slot', 'task', 'people_needed', 'member']
+
+
+def export_rows(team, date_from=None, date_to=None):
+    """Riadky exportu - jeden na člena rozvrhu, zoradené podľa dátumu a slotu
+
+    Číta priamo prepojovaciu tabuľku spojenú s rozvrhom, úlohou a členom
+    jedným dotazom cez serverový kurzor (iterator), takže pamäť nerastie
+    s dĺžkou histórie.
+    Členovia rozvrhu idú podľa ID, v rovnakom poradí ako v get_team_schedule.
+    Každý riadok je n-tica (schedule_id, dátum, slot, úloha, popis,
+    počet ľudí, ID člena, meno člena).
+    """
+    ScheduleMembers = TaskSchedule.members.through
+    rows = ScheduleMembers.objects.filter(taskschedule__team=team)
+    if date_from:
+        rows = rows.filter(taskschedule__date__gte=date_from)
+    if date_to:
+        rows = rows.filter(taskschedule__date__lte=date_to)
+    return (
+        rows.order_by('taskschedule__date', 'taskschedule__task__time_slot', 'taskschedule_id', 'teammember_id')
+        .values_list(
+            'taskschedule_id', 'taskschedule__date', 'taskschedule__task__time_slot',
+            'taskschedule__task__name', 'taskschedule__task__description',
+            'taskschedule__task__people_needed', 'teammember_id', 'teammember__name'
+        )
+        .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    )
+
+
+class Echo:
+    """Pseudo-súbor pre csv.writer - zápis vráti riadok namiesto ukladania"""
+
+    def write(self, value):
+        return value
+
+
+def stream_csv(rows):
+    """CSV s hlavičkou, jeden riadok na člena rozvrhu"""
+    writer = csv.writer(Echo())
+    yield writer.writerow(CSV_HEADER)
+    for schedule_id, target_date, time_slot, task_name, description, people_needed, member_id, member_name in rows:
+        yield writer.writerow([target_date.isoformat(), time_slot, task_name, people_needed, member_name])
+
+
+def stream_ndjson(rows):
+    """NDJSON, jeden rozvrh na riadok v tvare odpovede get_team_schedule"""
+    for schedule_id, schedule_rows in itertools.groupby(rows, key=lambda row: row[0]):
+        first = next(schedule_rows)
+        yield json.dumps({
+            'id': schedule_id,
+            'date': first[1].isoformat(),
+            'task': first[3],
+            'people_needed': first[5],
+            'time_slot': first[2],
+            'members': [first[7]] + [row[7] for row in schedule_rows]
+        }, ensure_ascii=False) + '\n'
+
+
+def stream_ical(rows, team):
+    """iCalendar s jednou celodennou udalosťou na člena, úlohu a slot"""
+    stamp = timezone.now().strftime('%Y%m%dT%H%M%SZ')
+    yield ical_line('BEGIN:VCALENDAR')
+    yield ical_line('VERSION:2.0')
+    yield ical_line('PRODID:-//SDB Worker//Rozvrh//SK')
+    yield ical_line(f'X-WR-CALNAME:{ical_text(team.name)}')
+    for schedule_id, target_date, time_slot, task_name, description, people_needed, member_id, member_name in rows:
+        yield ical_line('BEGIN:VEVENT')
+        yield ical_line(f'UID:{schedule_id}-{member_id}@sdb-worker')
+        yield ical_line(f'DTSTAMP:{stamp}')
+        yield ical_line(f'DTSTART;VALUE=DATE:{target_date.strftime("%Y%m%d")}')
+        yield ical_line(f'SUMMARY:{ical_text(f"{task_name} - {member_name}")}')
+        yield ical_line(f'DESCRIPTION:{ical_text(f"Časový slot {time_slot}. {description}".strip())}')
+        yield ical_line('END:VEVENT')
+    yield ical_line('END:VCALENDAR')
+
+
+def ical_text(value):
+    """Escapuje text podľa RFC 5545"""
+    return (
+        value.replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+        .replace('\r\n', '\\n').replace('\n', '\\n')
+    )
+
+
+def ical_line(line):
+    """Riadok ukončený CRLF a zalomený po 75 bajtoch (pokračovanie začína medzerou)"""
+    encoded = line.encode('utf-8')
+    if len(encoded) <= 75:
+        return line + '\r\n'
+
+    parts = []
+    current = ''
+    limit = 75
+    for char in line:
+        if len((current + char).encode('utf-8')) > limit:
+            parts.append(current)
+            current = ''
+            limit = 74  # Úvodná medzera pokračovania sa počíta do dĺžky
+        current += char
+    parts.append(current)
+    return '\r\n '.join(parts) + '\r\n'
+
+
+def stream_export(export_format, team, date_from=None, date_to=None):
+    """Generátor častí exportu v danom formáte"""
+    rows = export_rows(team, date_from, date_to)
+    if export_format == 'csv':
+        return stream_csv(rows)
+    if export_format == 'ics':
+        return stream_ical(rows, team)
+    return stream_ndjson(rows)
@@ -0,0 +1,310 @@
+import hashlib
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import TaskSchedule
+from .counters import apply_schedule_counts, load_schedule_groups, load_team_counters, lock_team
+from .response_cache import team_changed
+from .scheduling import PairCountMatrix, ScheduleHistory, ScheduleSnapshot, TaskSpec, generate_days, repair_day
+
+# Ako dlho (v sekundách) zostane návrh rozvrhu z dry_run pripravený na potvrdenie
+PROPOSAL_TIMEOUT = 60 * 60
+
+
+class ProposalExpired(Exception):
+    """Návrh rozvrhu už nie je v cache alebo sa medzitým zmenili údaje tímu"""
+
+
+def generate_team_schedules(team, members, tasks, date_from, date_to, engine_mode, seed=0):
+    """Vygeneruje rozvrhy tímu pre dni od date_from do date_to vrátane
+
+    Vráti zoznam vytvorených rozvrhov a správu pre používateľa.
+    """
+    dates = schedule_dates(date_from, date_to)
+    schedules = generate_schedules_for_dates(team, members, tasks, dates, engine_mode, seed)
+    return schedules, schedule_message('Vygenerovaný rozvrh', dates)
+
+
+def generate_schedules_for_dates(team, members, tasks, dates, engine_mode, seed=0):
+    """Vygeneruje a uloží rozvrhy tímu pre po sebe idúce dni
+
+    Z databázy sa zostaví snímka tímu pred prvým dňom, priradenia vypočíta
+    plánovač bez prístupu k databáze a potom sa všetky dni zapíšu v jednej
+    transakcii pevným počtom príkazov.
+    """
+    snapshot = load_schedule_snapshot(team, members, tasks, dates[0], seed, len(dates))
+    day_assignments = generate_days(snapshot, dates, engine_mode, settings.SCHEDULER_SEARCH_STRATEGY)
+    return write_schedules(team, members, tasks, dates, day_assignments)
+
+
+def propose_team_schedules(team, members, tasks, date_from, date_to, engine_mode, seed=0):
+    """Vypočíta návrh rozvrhov bez zápisu do databázy (dry_run)
+
+    Návrh sa uloží do cache pod odtlačkom vstupov, takže opakované zobrazenie
+    toho istého návrhu ho znova nepočíta a potvrdenie ho len zapíše.
+    Vráti (proposal_id, náhľad rozvrhov, správa).
+    """
+    dates = schedule_dates(date_from, date_to)
+    snapshot = load_schedule_snapshot(team, members, tasks, dates[0], seed, len(dates))
+    proposal_id = schedule_fingerprint(team, snapshot, dates, engine_mode)
+    
+    proposal = cache.get(proposal_cache_key(proposal_id))
+    if proposal is None:
+        proposal = {
+            'team_id': team.id,
+            'dates': dates,
+            'mode': engine_mode,
+            'seed': seed,
+            'day_assignments': generate_days(snapshot, dates, engine_mode, settings.SCHEDULER_SEARCH_STRATEGY),
+        }
+    cache.set(proposal_cache_key(proposal_id), proposal, PROPOSAL_TIMEOUT)
+    
+    preview = [
+        {
+            'id': None,
+            'date': target_date.isoformat(),
+            'task': task.name,
+            'people_needed': task.people_needed,
+            'time_slot': task.time_slot,
+            'members': [member.name for member in best_members]
+        }
+        for target_date, task, best_members in schedule_rows(members, tasks, proposal['day_assignments'])
+    ]
+    return proposal_id, preview, schedule_message('Návrh rozvrhu', dates)
+
+
+def commit_team_schedules(team, members, tasks, proposal_id):
+    """Zapíše návrh rozvrhov z dry_run bez nového výpočtu
+
+    Ak návrh v cache nie je, alebo sa od jeho výpočtu zmenili členovia,
+    úlohy či história tímu, vyhodí ProposalExpired.
+    """
+    proposal = cache.get(proposal_cache_key(proposal_id))
+    if proposal is None or proposal['team_id'] != team.id:
+        raise ProposalExpired()
+    
+    dates = proposal['dates']
+    snapshot = load_schedule_snapshot(team, members, tasks, dates[0], proposal['seed'], len(dates))
+    if schedule_fingerprint(team, snapshot, dates, proposal['mode']) != proposal_id:
+        raise ProposalExpired()
+    
+    schedules = write_schedules(team, members, tasks, dates, proposal['day_assignments'])
+    cache.delete(proposal_cache_key(proposal_id))
+    return schedules, schedule_message('Uložený rozvrh', dates)
+
+
+def schedule_dates(date_from, date_to):
+    """Zoznam dní od date_from do date_to vrátane"""
+    return [date_from + timedelta(days=offset) for offset in range((date_to - date_from).days + 1)]
+
+
+def schedule_message(prefix, dates):
+    """Správa pre používateľa s generovaným dňom alebo rozsahom dní"""
+    if dates[0] == dates[-1]:
+        return f'{prefix} pre {dates[0].strftime("%d.%m.%Y")}'
+    return f'{prefix} pre {dates[0].strftime("%d.%m.%Y")} - {dates[-1].strftime("%d.%m.%Y")}'
+
+
+def schedule_fingerprint(team, snapshot, dates, engine_mode):
+    """Odtlačok všetkých vstupov generovania: členovia, úlohy, počítadlá histórie, dni, režim a seed"""
+    state = {
+        'team': team.id,
+        'dates': [dates[0].isoformat(), dates[-1].isoformat()],
+        'mode': engine_mode,
+        'strategy': settings.SCHEDULER_SEARCH_STRATEGY,
+        'seed': snapshot.seed,
+        'members': snapshot.member_ids,
+        'tasks': [list(task) for task in snapshot.tasks],
+        'member_totals': sorted((member_id, count) for member_id, count in snapshot.member_totals.items() if count),
+        'pair_totals': sorted((min(first_id, second_id), max(first_id, second_id), count) for first_id, second_id, count in snapshot.pair_totals.items()),
+        'task_members': sorted(snapshot.history.task_member_masks.items()),
+        'task_groups': sorted((task_id, sorted(masks)) for task_id, masks in snapshot.history.task_group_masks.items()),
+    }
+    return hashlib.sha256(json.dumps(state).encode()).hexdigest()
+
+
+def proposal_cache_key(proposal_id):
+    """Kľúč návrhu rozvrhu v cache"""
+    return f'schedule-proposal:{proposal_id}'
+
+
+def write_schedules(team, members, tasks, dates, day_assignments):
+    """Nahradí rozvrhy tímu v rozsahu dní priradeniami plánovača a vráti ich pre odpoveď API"""
+    rows = schedule_rows(members, tasks, day_assignments)
+    
+    # Zapíš rozvrhy všetkých dní a ich príspevok k počítadlám naraz
+    with transaction.atomic():
+        # Rozvrhy na vymazanie sa čítajú až pod zámkom tímu, inak by dve súbežné
+        # generovania odpočítali tie isté staré rozvrhy a vymazali nové
+        lock_team(team)
+        
+        # Vymaž existujúce rozvrhy pre tieto dni (spolu s ich príspevkom k počítadlám)
+        delete_schedules(team, TaskSchedule.objects.filter(team=team, date__gte=dates[0], date__lte=dates[-1]))
+        created_schedules = insert_schedules(team, rows)
+        team_changed(team)
+    
+    return schedule_entries(created_schedules, rows)
+
+
+def repair_team_schedule(team, members, tasks, target_date, member_ids=(), task_ids=(), engine_mode='greedy', seed=0):
+    """Opraví rozvrh dňa po zmene členov alebo úloh bez generovania celého dňa
+
+    member_ids sú členovia, ktorí v daný deň nemôžu mať úlohu, task_ids úlohy,
+    ktoré sa zmenili. Znova sa obsadia len úlohy týchto členov, zmenené úlohy,
+    rozvrhy s iným počtom členov ako úloha potrebuje a aktívne úlohy bez rozvrhu.
+    Rozvrhy vymazaných úloh sa odstránia. Ostatné rozvrhy dňa zostanú.
+    Vráti (nové rozvrhy, počet odstránených, počet zachovaných).
+    """
+    unavailable = set(member_ids)
+    changed_tasks = set(task_ids)
+    tasks_by_id = {task.id: task for task in tasks}
+    
+    # Rozvrhy dňa sa čítajú a nahrádzajú pod zámkom tímu, aby súbežné zápisy
+    # nenahradili alebo neodpočítali tie isté rozvrhy dvakrát
+    with transaction.atomic():
+        lock_team(team)
+        
+        # Rozvrhy dňa a ich členovia - dva dotazy bez ohľadu na veľkosť tímu
+        day_schedules = TaskSchedule.objects.filter(team=team, date=target_date)
+        schedule_tasks = dict(day_schedules.values_list('id', 'task_id'))
+        schedule_members = {schedule_id: [] for schedule_id in schedule_tasks}
+        for schedule_id, member_id in TaskSchedule.members.through.objects.filter(
+            taskschedule__in=day_schedules.values('id')
+        ).values_list('taskschedule_id', 'teammember_id'):
+            if schedule_id in schedule_members:
+                schedule_members[schedule_id].append(member_id)
+        
+        kept = []
+        removed_ids = []
+        for schedule_id, task_id in schedule_tasks.items():
+            schedule_member_ids = schedule_members[schedule_id]
+            task = tasks_by_id.get(task_id)
+            if (
+                task is None
+                or task_id in changed_tasks
+                or unavailable.intersection(schedule_member_ids)
+                or len(schedule_member_ids) != task.people_needed
+            ):
+                removed_ids.append(schedule_id)
+            else:
+                kept.append((task_id, schedule_member_ids))
+        
+        kept_task_ids = {task_id for task_id, _ in kept}
+        repair_tasks = [task for task in tasks if task.id not in kept_task_ids]
+        
+        new_assignments = []
+        if repair_tasks:
+            available_members = [member for member in members if member.id not in unavailable]
+            snapshot = load_schedule_snapshot(team, available_members, tasks, target_date, seed)
+            new_assignments = repair_day(
+                snapshot,
+                target_date,
+                kept,
+                [TaskSpec(task.id, task.people_needed, task.time_slot) for task in repair_tasks],
+                engine_mode,
+                settings.SCHEDULER_SEARCH_STRATEGY
+            )
+        
+        rows = schedule_rows(members, tasks, [(target_date, new_assignments)])
+        delete_schedules(team, TaskSchedule.objects.filter(id__in=removed_ids))
+        created_schedules = insert_schedules(team, rows)
+        team_changed(team)
+    
+    return schedule_entries(created_schedules, rows), len(removed_ids), len(kept)
+
+
+def schedule_rows(members, tasks, day_assignments):
+    """Priradenia plánovača ako trojice (dátum, úloha, členovia) s inštanciami modelov"""
+    members_by_id = {member.id: member for member in members}
+    tasks_by_id = {task.id: task for task in tasks}
+    return [
+        (target_date, tasks_by_id[task_id], [members_by_id[member_id] for member_id in member_ids])
+        for target_date, assignments in day_assignments
+        for task_id, member_ids in assignments
+    ]
+
+
+def delete_schedules(team, schedules):
+    """Vymaže rozvrhy spolu s ich príspevkom k počítadlám tímu"""
+    apply_schedule_counts(team, load_schedule_groups(schedules), sign=-1)
+    schedules.delete()
+
+
+def insert_schedules(team, rows):
+    """Vloží rozvrhy a ich členov dvoma bulk_create a pripočíta ich k počítadlám"""
+    # Počítadlá sa menia pred zápisom, rovnako ako pri mazaní
+    apply_schedule_counts(team, [
+        (task.id, [member.id for member in best_members])
+        for target_date, task, best_members in rows
+    ])
+    
+    created_schedules = TaskSchedule.objects.bulk_create([
+        TaskSchedule(team=team, date=target_date, task=task)
+        for target_date, task, best_members in rows
+    ])
+    
+    # Členov všetkých rozvrhov pridaj jedným príkazom do prepojovacej tabuľky
+    ScheduleMembers = TaskSchedule.members.through
+    ScheduleMembers.objects.bulk_create([
+        ScheduleMembers(taskschedule_id=schedule.id, teammember_id=member.id)
+        for schedule, (target_date, task, best_members) in zip(created_schedules, rows)
+        for member in best_members
+    ])
+    return created_schedules
+
+
+def schedule_entries(created_schedules, rows):
+    """Rozvrhy vo formáte odpovede API"""
+    return [
+        {
+            'id': schedule.id,
+            'date': target_date.isoformat(),
+            'task': task.name,
+            'people_needed': task.people_needed,
+            'time_slot': task.time_slot,
+            'members': [member.name for member in best_members]
+        }
+        for schedule, (target_date, task, best_members) in zip(created_schedules, rows)
+    ]
+
+
+def load_schedule_snapshot(team, members, tasks, target_date, seed=0, days=1):
+    """Zostaví snímku tímu pred dátumom pre plánovač v pevnom počte dotazov
+
+    Snímka obsahuje len čisté dáta, plánovač už do databázy nepristupuje.
+    days: počet generovaných dní - určuje, pre ktoré úlohy treba skupiny z histórie.
+    """
+    member_totals, member_task_totals, pair_totals = load_team_counters(team, target_date)
+    member_ids = [member.id for member in members]
+    task_members = sorted((task_id, member_id) for (member_id, task_id), count in member_task_totals.items() if count > 0)
+    
+    # Skupiny z histórie sú potrebné len pre kontrolu vyčerpania kombinácií, a tá ich číta
+    # len pri úlohách, ktoré už robili všetci členovia. Každý generovaný deň pridá úlohe
+    # najviac people_needed nových členov, takže stačia úlohy, ktorým do plného pokrytia
+    # chýba najviac people_needed * (days - 1) členov.
+    done_by = {}
+    for task_id, member_id in task_members:
+        done_by.setdefault(task_id, set()).add(member_id)
+    group_task_ids = [
+        task.id for task in tasks
+        if len(set(member_ids) - done_by.get(task.id, set())) <= task.people_needed * (days - 1)
+    ]
+    task_groups = []
+    if group_task_ids:
+        task_schedules = TaskSchedule.objects.filter(team=team, task_id__in=group_task_ids, date__lt=target_date).order_by('id')
+        task_groups = [(task_id, sorted(group_member_ids)) for task_id, group_member_ids in load_schedule_groups(task_schedules)]
+    
+    history = ScheduleHistory(member_ids, task_members, task_groups)
+    return ScheduleSnapshot(
+        member_ids,
+        [TaskSpec(task.id, task.people_needed, task.time_slot) for task in tasks],
+        history,
+        member_totals,
+        PairCountMatrix.from_counts(member_ids, pair_totals),
+        team_name=team.name,
+        seed=seed
+    )
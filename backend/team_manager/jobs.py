@@ -0,0 +1,80 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .generation import generate_team_schedules
+from .models import ScheduleJob
+
+
+def fail_stale_jobs():
+    """Označí ako zlyhané generovania, ktoré bežia dlhšie ako SCHEDULER_JOB_TIMEOUT
+
+    Ak worker počas generovania zomrel, generovanie by inak zostalo navždy
+    v stave running a klienti by sa naň pýtali donekonečna. Vráti ich počet.
+    """
+    now = timezone.now()
+    return ScheduleJob.objects.filter(
+        status=ScheduleJob.STATUS_RUNNING,
+        started_at__lt=now - timedelta(seconds=settings.SCHEDULER_JOB_TIMEOUT)
+    ).update(
+        status=ScheduleJob.STATUS_FAILED,
+        error='Generovanie neskončilo v časovom limite, worker pravdepodobne zlyhal',
+        finished_at=now
+    )
+
+
+def claim_next_job():
+    """Prevezme najstaršie čakajúce generovanie, alebo vráti None
+
+    Riadok sa zamkne so SKIP LOCKED, takže viac workerov si nikdy
+    nevezme to isté generovanie a navzájom sa neblokujú.
+    """
+    with transaction.atomic():
+        job = (
+            ScheduleJob.objects.select_for_update(skip_locked=True)
+            .filter(status=ScheduleJob.STATUS_PENDING)
+            .order_by('created_at', 'id')
+            .first()
+        )
+        if job is None:
+            return None
+
+        job.status = ScheduleJob.STATUS_RUNNING
+        job.started_at = timezone.now()
+        job.save(update_fields=['status', 'started_at'])
+    return job
+
+
+def run_job(job):
+    """Vygeneruje rozvrhy pre prevzaté generovanie a uloží výsledok alebo chybu"""
+    try:
+        team = job.team
+        members = list(team.members.all())
+        tasks = list(team.tasks.filter(is_deleted=False))
+        if not members or not tasks:
+            raise ValueError('Tím musí mať aspoň jedného člena a jednu úlohu')
+
+        schedules, message = generate_team_schedules(team, members, tasks, job.date_from, job.date_to, job.mode, job.seed)
+        job.status = ScheduleJob.STATUS_DONE
+        job.result = {'schedules': schedules, 'message': message}
+    except Exception as e:
+        job.status = ScheduleJob.STATUS_FAILED
+        job.error = str(e)
+
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'result', 'error', 'finished_at'])
+    return job
+
+
+def run_pending_jobs():
+    """Spracuje čakajúce generovania, kým nejaké sú; vráti ich počet"""
+    fail_stale_jobs()
+    processed = 0
+    while True:
+        job = claim_next_job()
+        if job is None:
+            return processed
+        run_job(job)
+        processed += 1
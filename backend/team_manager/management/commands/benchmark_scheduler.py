@@ -0,0 +1,151 @@
+import json
+import random
+import statistics
+import time
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import RequestFactory
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from team_manager.generation import generate_team_schedules
+from team_manager.models import Team, TeamMember, Task
+from team_manager.views import MAX_SCHEDULE_RANGE_DAYS, generate_schedule
+
+# Syntetické scenáre: počet členov, počet úloh, dni histórie a dni generované jednou požiadavkou
+SCENARIOS = {
+    'small': {'members': 8, 'tasks': 6, 'history_days': 30, 'days': 1},
+    'medium': {'members': 25, 'tasks': 15, 'history_days': 180, 'days': 1},
+    'large': {'members': 60, 'tasks': 30, 'history_days': 365, 'days': 1},
+    'range': {'members': 25, 'tasks': 15, 'history_days': 180, 'days': 30},
+}
+# Prvý deň syntetickej histórie
+HISTORY_START = date(2024, 1, 1)
+# Rozloženie počtu ľudí na úlohu
+PEOPLE_NEEDED_CHOICES = [1, 1, 1, 2, 2, 3]
+
+
+class Rollback(Exception):
+    """Zruší transakciu so syntetickými dátami po dokončení merania"""
+
+
+class Command(BaseCommand):
+    help = "Zmeria čas a počet SQL dotazov generovania rozvrhu na syntetických tímoch"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scenario', action='append', dest='scenarios', choices=sorted(SCENARIOS), help="Scenár (možno zadať viackrát), predvolene všetky")
+        parser.add_argument('--repeat', type=int, default=3, help="Počet meraní každého scenára")
+        parser.add_argument('--mode', choices=['greedy', 'slot'], default=settings.SCHEDULER_ENGINE_MODE, help="Režim generovania")
+        parser.add_argument('--strategy', default=settings.SCHEDULER_SEARCH_STRATEGY, help="Stratégia hľadania skupín")
+        parser.add_argument('--seed', type=int, default=0, help="Seed pre syntetické dáta")
+        parser.add_argument('--output', help="Súbor, do ktorého sa uložia výsledky vo formáte JSON")
+
+    def handle(self, *args, **options):
+        names = options['scenarios'] or list(SCENARIOS)
+        if options['repeat'] < 1:
+            raise CommandError('Počet meraní musí byť aspoň 1')
+
+        results = []
+        with override_settings(SCHEDULER_SEARCH_STRATEGY=options['strategy']):
+            for name in names:
+                result = self.run_scenario(name, SCENARIOS[name], options)
+                results.append(result)
+                self.stdout.write(
+                    f"{name}: medián {result['wall_time_median']:.3f} s, "
+                    f"{result['queries']} dotazov, {result['schedules']} rozvrhov"
+                )
+
+        report = {
+            'created_at': timezone.now().isoformat(),
+            'database': connection.vendor,
+            'mode': options['mode'],
+            'strategy': options['strategy'],
+            'seed': options['seed'],
+            'scenarios': results,
+        }
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump(report, output, indent=2)
+            self.stdout.write(f"Výsledky uložené do {options['output']}")
+        self.stdout.write(self.style.SUCCESS("Hotovo"))
+
+    def run_scenario(self, name, scenario, options):
+        """Postaví syntetický tím s históriou, zmeria generovanie a všetko vráti späť"""
+        result = {'name': name, **scenario}
+        try:
+            with transaction.atomic():
+                team = build_team(name, scenario, random.Random(options['seed']))
+                build_history(team, scenario['history_days'], options['mode'])
+
+                date_from = HISTORY_START + timedelta(days=scenario['history_days'])
+                date_to = date_from + timedelta(days=scenario['days'] - 1)
+                payload = json.dumps({
+                    'team_id': team.id,
+                    'admin_password': team.admin_password,
+                    'date_from': date_from.isoformat(),
+                    'date_to': date_to.isoformat(),
+                    'mode': options['mode'],
+                })
+
+                # Každé meranie vygeneruje tie isté dni znova, takže práca je rovnaká
+                wall_times = []
+                for _ in range(options['repeat']):
+                    request = RequestFactory().post('/api/generate-schedule/', payload, content_type='application/json')
+                    query_count = [0]
+
+                    def count_queries(execute, sql, params, many, context):
+                        query_count[0] += 1
+                        return execute(sql, params, many, context)
+
+                    started = time.perf_counter()
+                    with connection.execute_wrapper(count_queries):
+                        response = generate_schedule(request)
+                    wall_times.append(time.perf_counter() - started)
+
+                    data = json.loads(response.content)
+                    if response.status_code != 200:
+                        raise CommandError(f"Scenár {name} zlyhal: {data.get('error')}")
+
+                result.update({
+                    'wall_times': wall_times,
+                    'wall_time_median': statistics.median(wall_times),
+                    'wall_time_min': min(wall_times),
+                    'queries': query_count[0],
+                    'schedules': len(data['schedules']),
+                })
+                raise Rollback
+        except Rollback:
+            pass
+        return result
+
+
+def build_team(name, scenario, rng):
+    """Vytvorí tím so syntetickými členmi a úlohami so zmiešaným počtom ľudí a slotmi"""
+    team = Team.objects.create(name=f'benchmark-{name}')
+    TeamMember.objects.bulk_create([
+        TeamMember(team=team, name=f'Člen {index + 1}')
+        for index in range(scenario['members'])
+    ])
+    Task.objects.bulk_create([
+        Task(
+            team=team,
+            name=f'Úloha {index + 1}',
+            people_needed=rng.choice(PEOPLE_NEEDED_CHOICES),
+            time_slot=rng.randint(1, 5)
+        )
+        for index in range(scenario['tasks'])
+    ])
+    return team
+
+
+def build_history(team, history_days, engine_mode):
+    """Naplní históriu rozvrhov samotným plánovačom, po úsekoch najviac MAX_SCHEDULE_RANGE_DAYS dní"""
+    members = list(team.members.all())
+    tasks = list(team.tasks.all())
+    for offset in range(0, history_days, MAX_SCHEDULE_RANGE_DAYS):
+        date_from = HISTORY_START + timedelta(days=offset)
+        date_to = HISTORY_START + timedelta(days=min(offset + MAX_SCHEDULE_RANGE_DAYS, history_days) - 1)
+        generate_team_schedules(team, members, tasks, date_from, date_to, engine_mode)
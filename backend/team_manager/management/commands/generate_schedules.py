@@ -0,0 +1,97 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.utils import timezone
+
+from team_manager.generation import generate_team_schedules
+from team_manager.models import Team
+
+
+def generate_for_team(team_id, target_date, engine_mode):
+    """Vygeneruje rozvrh jedného tímu; vráti (team_id, názov, počet rozvrhov, čas, chyba)"""
+    started = time.perf_counter()
+    team_name = str(team_id)
+    try:
+        team = Team.objects.get(id=team_id)
+        team_name = team.name
+        members = list(team.members.all())
+        tasks = list(team.tasks.filter(is_deleted=False))
+        if not members or not tasks:
+            raise ValueError('Tím musí mať aspoň jedného člena a jednu úlohu')
+
+        schedules, message = generate_team_schedules(team, members, tasks, target_date, target_date, engine_mode)
+        return team_id, team_name, len(schedules), time.perf_counter() - started, None
+    except Exception as e:
+        return team_id, team_name, 0, time.perf_counter() - started, str(e)
+    finally:
+        connections.close_all()
+
+
+class Command(BaseCommand):
+    help = "Vygeneruje rozvrh na jeden deň pre všetky (alebo vybrané) tímy paralelne"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--date', help="Dátum vo formáte YYYY-MM-DD, predvolene zajtra")
+        parser.add_argument('--teams', type=int, nargs='+', dest='team_ids', help="ID tímov, predvolene všetky tímy")
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="Počet procesov, predvolene počet jadier")
+        parser.add_argument('--mode', choices=['greedy', 'slot'], default=settings.SCHEDULER_ENGINE_MODE, help="Režim generovania")
+
+    def handle(self, *args, **options):
+        if options['date']:
+            try:
+                target_date = datetime.strptime(options['date'], '%Y-%m-%d').date()
+            except ValueError:
+                raise CommandError('Dátum musí byť vo formáte YYYY-MM-DD')
+        else:
+            target_date = timezone.localdate() + timedelta(days=1)
+
+        teams = Team.objects.order_by('id')
+        if options['team_ids']:
+            teams = teams.filter(id__in=options['team_ids'])
+        team_ids = list(teams.values_list('id', flat=True))
+        workers = max(1, min(options['workers'], len(team_ids) or 1))
+
+        self.stdout.write(f"Generujem rozvrh na {target_date.strftime('%d.%m.%Y')} pre {len(team_ids)} tímov ({workers} procesov)")
+        started = time.perf_counter()
+
+        if workers == 1:
+            results = (generate_for_team(team_id, target_date, options['mode']) for team_id in team_ids)
+            failures = self._report(results, len(team_ids), started)
+        else:
+            # Pripojenia do databázy sa nesmú zdieľať medzi procesmi,
+            # každý proces poolu si otvorí vlastné pri prvom dotaze
+            connections.close_all()
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('fork')) as executor:
+                futures = [
+                    executor.submit(generate_for_team, team_id, target_date, options['mode'])
+                    for team_id in team_ids
+                ]
+                failures = self._report((future.result() for future in as_completed(futures)), len(team_ids), started)
+
+        # Nenulový návratový kód, aby nočné spúšťanie zlyhanie zaznamenalo
+        if failures:
+            raise CommandError(f"Generovanie zlyhalo pre {failures} tímov")
+
+    def _report(self, results, team_count, started):
+        failures = 0
+        schedule_total = 0
+        for team_id, team_name, schedule_count, elapsed, error in results:
+            if error:
+                failures += 1
+                self.stdout.write(self.style.ERROR(f"{team_name} (ID {team_id}): chyba po {elapsed:.2f} s - {error}"))
+            else:
+                schedule_total += schedule_count
+                self.stdout.write(f"{team_name} (ID {team_id}): {schedule_count} rozvrhov za {elapsed:.2f} s")
+
+        summary = f"Tímy: {team_count}, úspešné: {team_count - failures}, chyby: {failures}, rozvrhy: {schedule_total}, čas: {time.perf_counter() - started:.2f} s"
+        if failures:
+            self.stdout.write(self.style.WARNING(summary))
+        else:
+            self.stdout.write(self.style.SUCCESS(summary))
+        return failures
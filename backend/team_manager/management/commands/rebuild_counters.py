@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from team_manager.counters import rebuild_team_counters
+from team_manager.models import Team
+
+
+class Command(BaseCommand):
+    help = "Prepočíta počítadlá úloh a dvojíc z histórie rozvrhov"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--team', type=int, action='append', dest='team_ids', help="ID tímu (možno zadať viackrát), predvolene všetky tímy")
+
+    def handle(self, *args, **options):
+        teams = Team.objects.all()
+        if options['team_ids']:
+            teams = teams.filter(id__in=options['team_ids'])
+
+        for team in teams:
+            rebuild_team_counters(team)
+            self.stdout.write(f"Počítadlá pre tím {team.name} boli prepočítané")
+
+        self.stdout.write(self.style.SUCCESS("Hotovo"))
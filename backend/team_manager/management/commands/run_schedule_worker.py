@@ -0,0 +1,52 @@
+import multiprocessing
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from team_manager.jobs import run_pending_jobs
+
+
+def work(poll_interval, once):
+    """Slučka jedného workera: spracuje čakajúce generovania a potom chvíľu čaká"""
+    while True:
+        run_pending_jobs()
+        if once:
+            return
+        time.sleep(poll_interval)
+
+
+class Command(BaseCommand):
+    help = "Spracúva generovania rozvrhov spustené na pozadí"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=settings.SCHEDULER_WORKER_CONCURRENCY, help="Počet súbežných procesov workera")
+        parser.add_argument('--poll-interval', type=float, default=1.0, help="Počet sekúnd medzi kontrolami fronty")
+        parser.add_argument('--once', action='store_true', help="Spracuje čakajúce generovania a skončí")
+
+    def handle(self, *args, **options):
+        concurrency = max(1, options['concurrency'])
+        poll_interval = options['poll_interval']
+        once = options['once']
+
+        self.stdout.write(f"Worker generovania rozvrhov beží s {concurrency} procesmi")
+        if concurrency == 1:
+            work(poll_interval, once)
+            return
+
+        # Pripojenia do databázy sa nesmú zdieľať medzi procesmi, každý si otvorí vlastné
+        connections.close_all()
+        context = multiprocessing.get_context('fork')
+        processes = [
+            context.Process(target=work, args=(poll_interval, once), daemon=True)
+            for _ in range(concurrency)
+        ]
+        for process in processes:
+            process.start()
+        try:
+            for process in processes:
+                process.join()
+        except KeyboardInterrupt:
+            for process in processes:
+                process.terminate()
@@ -16,6 +16,10 @@ class Team(models.Model):
     admin_password = models.CharField(max_length=10, default=generate_admin_password, verbose_name="Heslo pre admina")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Zvyšuje sa pri každej zmene členov, úloh alebo rozvrhov tímu (ETag čítaní)
+    version = models.PositiveBigIntegerField(default=0, verbose_name="Verzia")
+    # Či sú počítadlá plánovača (MemberCounter, ...) zostavené z histórie rozvrhov
+    counters_built = models.BooleanField(default=False, verbose_name="Počítadlá zostavené")
 
     class Meta:
         verbose_name = "Tím"
@@ -31,6 +35,10 @@ class Team(models.Model):
             self.admin_password = generate_admin_password()
         super().save(*args, **kwargs)
 
+    def bump_version(self):
+        """Zvýši verziu tímu jedným UPDATE, bezpečne aj pri súbežných zápisoch"""
+        Team.objects.filter(pk=self.pk).update(version=models.F('version') + 1)
+
 class TeamMember(models.Model):
     team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name='members', verbose_name="Tím")
     name = models.CharField(max_length=100, verbose_name="Meno")
@@ -77,3 +85,75 @@ class TaskSchedule(models.Model):
     def __str__(self):
         member_names = ", ".join([member.name for member in self.members.all()])
         return f"{self.task.name} - {self.date} ({member_names})"
+
+class MemberCounter(models.Model):
+    team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name='member_counters', verbose_name="Tím")
+    member = models.OneToOneField(TeamMember, on_delete=models.CASCADE, related_name='counter', verbose_name="Člen")
+    task_count = models.PositiveIntegerField(default=0, verbose_name="Počet úloh")
+
+    class Meta:
+        verbose_name = "Počítadlo úloh člena"
+        verbose_name_plural = "Počítadlá úloh členov"
+
+    def __str__(self):
+        return f"{self.member.name}: {self.task_count}"
+
+class MemberTaskCounter(models.Model):
+    team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name='member_task_counters', verbose_name="Tím")
+    member = models.ForeignKey(TeamMember, on_delete=models.CASCADE, related_name='task_counters', verbose_name="Člen")
+    task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name='member_counters', verbose_name="Úloha")
+    count = models.PositiveIntegerField(default=0, verbose_name="Počet")
+
+    class Meta:
+        verbose_name = "Počítadlo úlohy člena"
+        verbose_name_plural = "Počítadlá úloh podľa členov"
+        unique_together = ['member', 'task']
+
+    def __str__(self):
+        return f"{self.member.name} - {self.task.name}: {self.count}"
+
+class MemberPairCounter(models.Model):
+    team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name='member_pair_counters', verbose_name="Tím")
+    member_low = models.ForeignKey(TeamMember, on_delete=models.CASCADE, related_name='pair_counters_low', verbose_name="Člen (nižšie ID)")
+    member_high = models.ForeignKey(TeamMember, on_delete=models.CASCADE, related_name='pair_counters_high', verbose_name="Člen (vyššie ID)")
+    count = models.PositiveIntegerField(default=0, verbose_name="Počet spoločných úloh")
+
+    class Meta:
+        verbose_name = "Počítadlo dvojice"
+        verbose_name_plural = "Počítadlá dvojíc"
+        unique_together = ['member_low', 'member_high']
+
+    def __str__(self):
+        return f"{self.member_low.name} + {self.member_high.name}: {self.count}"
+
+class ScheduleJob(models.Model):
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Čaká'),
+        (STATUS_RUNNING, 'Beží'),
+        (STATUS_DONE, 'Hotovo'),
+        (STATUS_FAILED, 'Zlyhalo'),
+    ]
+
+    team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name='schedule_jobs', verbose_name="Tím")
+    date_from = models.DateField(verbose_name="Dátum od")
+    date_to = models.DateField(verbose_name="Dátum do")
+    mode = models.CharField(max_length=20, default='greedy', verbose_name="Režim generovania")
+    seed = models.IntegerField(default=0, verbose_name="Seed")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING, verbose_name="Stav")
+    result = models.JSONField(null=True, blank=True, verbose_name="Výsledok")
+    error = models.TextField(blank=True, verbose_name="Chyba")
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Generovanie rozvrhu"
+        verbose_name_plural = "Generovania rozvrhov"
+        indexes = [models.Index(fields=['status', 'created_at'])]
+
+    def __str__(self):
+        return f"{self.team.name}: {self.date_from} - {self.date_to} ({self.get_status_display()})"
@@ -0,0 +1,111 @@
+import hashlib
+import json
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+
+# Kľúče počítadiel zásahov a minutí cache
+STATS_KEYS = {'hits': 'team-response-stats:hits', 'misses': 'team-response-stats:misses'}
+# Po koľkých sekundách proces zapíše svoje počty zásahov a minutí do cache
+STATS_FLUSH_INTERVAL = 60
+
+# Počty zásahov a minutí tohto procesu, ktoré ešte nie sú v cache
+_pending_stats = {'hits': 0, 'misses': 0}
+_stats_lock = threading.Lock()
+_last_flush = time.monotonic()
+
+
+def generation_key(team_id):
+    """Kľúč generácie odpovedí tímu - zvýšenie zneplatní všetky jeho uložené odpovede"""
+    return f'team-response-generation:{team_id}'
+
+
+def response_key(team, endpoint, params):
+    """Kľúč odpovede podľa tímu, jeho verzie a generácie, endpointu a parametrov"""
+    generation = cache.get_or_set(generation_key(team.id), 0, None)
+    params_hash = hashlib.sha256(json.dumps(params, sort_keys=True).encode()).hexdigest()
+    return f'team-response:{team.id}:{team.version}:{generation}:{endpoint}:{params_hash}'
+
+
+def cached_response_body(team, endpoint, params, build_payload):
+    """Vráti JSON telo odpovede z cache, alebo ho zostaví cez build_payload a uloží
+
+    build_payload sa volá len pri minutí cache a vracia slovník odpovede.
+    """
+    key = response_key(team, endpoint, params)
+    body = cache.get(key)
+    if body is not None:
+        count('hits')
+        return body
+
+    count('misses')
+    body = json.dumps(build_payload(), cls=DjangoJSONEncoder)
+    cache.set(key, body, settings.TEAM_RESPONSE_CACHE_TIMEOUT)
+    return body
+
+
+def invalidate_team(team_id):
+    """Zneplatní všetky uložené odpovede tímu (po potvrdení transakcie, ak nejaká beží)"""
+    def bump_generation():
+        key = generation_key(team_id)
+        cache.add(key, 0, None)
+        cache.incr(key)
+
+    transaction.on_commit(bump_generation)
+
+
+def team_changed(team):
+    """Zápis do tímu: zvýši verziu tímu a zneplatní jeho odpovede v cache"""
+    team.bump_version()
+    invalidate_team(team.id)
+
+
+def count(name):
+    """Pripočíta zásah alebo minutie do počítadla procesu, do cache ho zapíše raz za interval"""
+    with _stats_lock:
+        _pending_stats[name] += 1
+        if time.monotonic() - _last_flush < STATS_FLUSH_INTERVAL:
+            return
+    flush_stats()
+
+
+def flush_stats():
+    """Zapíše počty zásahov a minutí tohto procesu do cache
+
+    Čítania tak nezapisujú do súborovej cache pri každej požiadavke. Súbežné
+    zápisy viacerých procesov nie sú na súborovej cache atomické, štatistika
+    je preto len orientačná.
+    """
+    global _last_flush
+    with _stats_lock:
+        pending = dict(_pending_stats)
+        for name in _pending_stats:
+            _pending_stats[name] = 0
+        _last_flush = time.monotonic()
+
+    for name, amount in pending.items():
+        if not amount:
+            continue
+        key = STATS_KEYS[name]
+        cache.add(key, 0, None)
+        try:
+            cache.incr(key, amount)
+        except ValueError:
+            # Kľúč medzitým vypršal alebo ho iný proces vymazal
+            cache.set(key, amount, None)
+
+
+def cache_stats():
+    """Počty zásahov a minutí cache odpovedí a podiel zásahov
+
+    Iné procesy sa do počtov premietnu najneskôr po STATS_FLUSH_INTERVAL.
+    """
+    flush_stats()
+    stats = {name: cache.get(key, 0) for name, key in STATS_KEYS.items()}
+    total = stats['hits'] + stats['misses']
+    stats['hit_ratio'] = round(stats['hits'] / total, 4) if total else None
+    return stats
@@ -0,0 +1,8 @@
+"""Plánovač rozvrhov - nezávislý od Django, pracuje so snímkou dát tímu"""
+from .history import ScheduleHistory
+from .occupancy import SlotOccupancy
+from .pairs import PairCountMatrix
+from .state import DayState
+from .engine import ScheduleSnapshot, TaskSpec, generate_days, repair_day, schedule_seed
+
+__all__ = ['ScheduleHistory', 'SlotOccupancy', 'PairCountMatrix', 'DayState', 'ScheduleSnapshot', 'TaskSpec', 'generate_days', 'repair_day', 'schedule_seed']
@@ -0,0 +1,216 @@
+from .scoring import FairnessState, calculate_group_score
+
+# Maximálny počet kôl lokálneho vylepšovania skupín
+MAX_LOCAL_SEARCH_ROUNDS = 50
+
+
+def hungarian(cost):
+    """Maďarská metóda - priradenie riadkov stĺpcom s minimálnou celkovou cenou
+
+    Matica musí mať najviac toľko riadkov ako stĺpcov. Vráti pre každý riadok
+    index priradeného stĺpca.
+    """
+    row_count = len(cost)
+    column_count = len(cost[0]) if row_count else 0
+    infinity = float('inf')
+
+    # Potenciály riadkov a stĺpcov, indexované od 1 (index 0 je pomocný)
+    row_potential = [0] * (row_count + 1)
+    column_potential = [0] * (column_count + 1)
+    column_row = [0] * (column_count + 1)
+    previous_column = [0] * (column_count + 1)
+
+    for row in range(1, row_count + 1):
+        column_row[0] = row
+        current_column = 0
+        min_slack = [infinity] * (column_count + 1)
+        used = [False] * (column_count + 1)
+        while True:
+            used[current_column] = True
+            current_row = column_row[current_column]
+            delta = infinity
+            next_column = 0
+            for column in range(1, column_count + 1):
+                if used[column]:
+                    continue
+                slack = cost[current_row - 1][column - 1] - row_potential[current_row] - column_potential[column]
+                if slack < min_slack[column]:
+                    min_slack[column] = slack
+                    previous_column[column] = current_column
+                if min_slack[column] < delta:
+                    delta = min_slack[column]
+                    next_column = column
+            for column in range(column_count + 1):
+                if used[column]:
+                    row_potential[column_row[column]] += delta
+                    column_potential[column] -= delta
+                else:
+                    min_slack[column] -= delta
+            current_column = next_column
+            if column_row[current_column] == 0:
+                break
+
+        # Prepni striedavú cestu
+        while current_column:
+            column = previous_column[current_column]
+            column_row[current_column] = column_row[column]
+            current_column = column
+
+    assignment = [None] * row_count
+    for column in range(1, column_count + 1):
+        if column_row[column]:
+            assignment[column_row[column] - 1] = column - 1
+    return assignment
+
+
+def lexicographic_costs(keys):
+    """Prevedie maticu n-tíc na maticu celých čísel pre maďarskú metódu
+
+    Váha každej zložky je väčšia ako najväčší možný súčet nižších zložiek
+    cez všetky riadky, takže súčty priradení sa zoradia rovnako ako súčty
+    n-tíc po zložkách - vyššia zložka vždy rozhodne a nemožno ju vymeniť za
+    nižšie. Zložky musia byť nezáporné celé čísla.
+    Vráti (matica cien, cena nepriradenia), cena nepriradenia je vyššia
+    ako cena akéhokoľvek úplného priradenia.
+    """
+    entries = [key for row in keys for key in row]
+    if not entries:
+        return [[] for row in keys], 1
+
+    weights = []
+    weight = 1
+    for level in reversed(range(len(entries[0]))):
+        weights.insert(0, weight)
+        weight *= len(keys) * max(key[level] for key in entries) + 1
+
+    cost = [[sum(level_weight * value for level_weight, value in zip(weights, key)) for key in row] for row in keys]
+    return cost, weight
+
+
+def solve_time_slot(tasks, member_ids, member_task_count, member_pair_count, history, search):
+    """Priradí naraz všetky úlohy jedného časového slotu
+
+    tasks sú dvojice (task_id, people_needed), member_ids sú dostupní členovia
+    v poradí rotácie. Úlohy pre viac ľudí dostanú počiatočné skupiny zo stratégie
+    hľadania, úlohy pre jedného človeka sa priradia maďarskou metódou a skupiny
+    sa potom vylepšujú výmenami členov, kým klesá cena celého slotu.
+    Cena sa porovnáva v rovnakom poradí ako pri hľadaní skupín: najprv počet
+    opakovaní úlohy, potom skóre spravodlivosti, potom skóre skupín.
+    Vráti slovník task_id -> zoznam ID členov (None ak úlohu nemožno obsadiť).
+    """
+    assignments = {}
+    free_members = list(member_ids)
+
+    # Úlohy pre viac ľudí - najprv tie najväčšie, majú najmenej možností
+    group_tasks = sorted(
+        [(task_id, people_needed) for task_id, people_needed in tasks if people_needed > 1],
+        key=lambda task: -task[1]
+    )
+    for task_id, people_needed in group_tasks:
+        if len(free_members) < people_needed:
+            assignments[task_id] = None
+            continue
+
+        eligible = [m for m in free_members if not history.has_done_task(m, task_id)]
+        best_combinations = search(eligible, people_needed, member_task_count, member_pair_count)
+        if best_combinations:
+            group = list(best_combinations[0])
+        else:
+            group = sorted(free_members, key=member_task_count.get)[:people_needed]
+
+        assignments[task_id] = group
+        free_members = [m for m in free_members if m not in group]
+
+    # Úlohy pre jedného človeka - jedno riešenie priraďovacieho problému
+    single_tasks = [task_id for task_id, people_needed in tasks if people_needed == 1]
+    if single_tasks:
+        # Opakovanie úlohy, spravodlivosť, skóre člena a pri zhode poradie rotácie
+        fairness = FairnessState(member_task_count)
+        cost, unassigned_cost = lexicographic_costs([
+            [
+                (
+                    1 if history.has_done_task(member_id, task_id) else 0,
+                    fairness.score([member_id]),
+                    calculate_group_score([member_id], member_task_count, member_pair_count),
+                    position
+                )
+                for position, member_id in enumerate(free_members)
+            ]
+            for task_id in single_tasks
+        ])
+        # Fiktívni členovia pre prípad, že úloh je viac ako voľných členov
+        for row in cost:
+            row.extend([unassigned_cost] * max(0, len(single_tasks) - len(free_members)))
+
+        for task_id, column in zip(single_tasks, hungarian(cost)):
+            if column is not None and column < len(free_members):
+                assignments[task_id] = [free_members[column]]
+            else:
+                assignments[task_id] = None
+
+    for task_id, people_needed in tasks:
+        if people_needed < 1:
+            assignments[task_id] = None
+
+    _improve_groups(assignments, group_tasks, member_ids, member_task_count, member_pair_count, history)
+    return assignments
+
+
+def _improve_groups(assignments, group_tasks, member_ids, member_task_count, member_pair_count, history):
+    """Lokálne vylepšovanie skupín výmenou člena skupiny za voľného člena alebo člena inej skupiny"""
+    group_task_ids = [task_id for task_id, people_needed in group_tasks if assignments.get(task_id)]
+    if not group_task_ids:
+        return
+
+    # Počty úloh sa počas vylepšovania nemenia, histogram stačí zostaviť raz
+    fairness = FairnessState(member_task_count)
+
+    def slot_cost():
+        # Porovnáva sa po zložkách, opakovanie úlohy sa nikdy nevymení za spravodlivosť
+        assigned = [member_id for group in assignments.values() if group for member_id in group]
+        repeats = sum(
+            1 for task_id in group_task_ids for member_id in assignments[task_id]
+            if history.has_done_task(member_id, task_id)
+        )
+        group_score = sum(
+            calculate_group_score(assignments[task_id], member_task_count, member_pair_count)
+            for task_id in group_task_ids
+        )
+        return repeats, fairness.score(assigned), group_score
+
+    current_cost = slot_cost()
+    for _ in range(MAX_LOCAL_SEARCH_ROUNDS):
+        improved = False
+        assigned = {member_id for group in assignments.values() if group for member_id in group}
+        free_members = [member_id for member_id in member_ids if member_id not in assigned]
+
+        for task_id in group_task_ids:
+            group = assignments[task_id]
+            for position in range(len(group)):
+                # Výmena s voľným členom
+                for member_id in free_members:
+                    group[position], replaced = member_id, group[position]
+                    new_cost = slot_cost()
+                    if new_cost < current_cost:
+                        current_cost = new_cost
+                        free_members[free_members.index(member_id)] = replaced
+                        improved = True
+                        break
+                    group[position] = replaced
+
+                # Výmena s členom inej skupiny
+                for other_task_id in group_task_ids:
+                    if other_task_id == task_id:
+                        continue
+                    other_group = assignments[other_task_id]
+                    for other_position in range(len(other_group)):
+                        group[position], other_group[other_position] = other_group[other_position], group[position]
+                        new_cost = slot_cost()
+                        if new_cost < current_cost:
+                            current_cost = new_cost
+                            improved = True
+                            continue
+                        group[position], other_group[other_position] = other_group[other_position], group[position]
+
+        if not improved:
+            break
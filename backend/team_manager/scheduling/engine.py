@@ -0,0 +1,273 @@
+import random
+from collections import Counter, namedtuple
+
+from .assignment import solve_time_slot
+from .occupancy import SlotOccupancy
+from .pairs import PairCountMatrix
+from .scoring import FairnessState
+from .search import get_search_strategy
+from .state import DayState
+
+# Úloha tak, ako ju vidí plánovač
+TaskSpec = namedtuple('TaskSpec', ['id', 'people_needed', 'time_slot'])
+
+
+class ScheduleSnapshot:
+    """Vstup plánovača - čisté dáta bez väzby na databázu
+
+    Obsahuje členov a úlohy tímu, históriu rozvrhov pred prvým generovaným
+    dňom a počítadlá úloh a dvojíc z tej istej histórie. Plánovač históriu
+    počas generovania viacerých dní dopĺňa, počítadlá si kopíruje.
+    """
+
+    def __init__(self, member_ids, tasks, history, member_totals, pair_totals, team_name='', seed=0):
+        # member_ids: ID členov v poradí, v akom ich vracia tím
+        # tasks: zoznam TaskSpec (bez vymazaných úloh)
+        # history: ScheduleHistory pred prvým generovaným dňom
+        # member_totals: ID člena -> počet úloh v histórii
+        # pair_totals: PairCountMatrix - počty spoločných úloh dvojíc v histórii
+        # team_name: názov tímu pre správy v logu
+        # seed: posun seedu, rôzne hodnoty dajú rôzne (ale opakovateľné) rozvrhy
+        self.member_ids = list(member_ids)
+        self.tasks = list(tasks)
+        self.history = history
+        self.member_totals = member_totals
+        self.pair_totals = pair_totals
+        self.team_name = team_name
+        self.seed = seed
+
+
+def schedule_seed(target_date, combinations_exhausted=False, seed=0):
+    """Seed generátora náhodných čísel pre deň
+
+    Odvodený je od poradového čísla dátumu, nie od hash(), ktorý Python
+    náhodne mení medzi procesmi - rovnaký deň tak dá rovnaký rozvrh
+    v každom procese aj workeri.
+    """
+    seed_value = (target_date.toordinal() + seed) % 1000000
+    if combinations_exhausted:
+        # Ak sa vyčerpali kombinácie, použij iný seed pre leitmotiv
+        seed_value = (seed_value + 1) % 1000000
+    return seed_value
+
+
+def generate_days(snapshot, dates, engine_mode='greedy', search_strategy=None):
+    """Vygeneruje priradenia pre po sebe idúce dni
+
+    Priradenia dňa sa prenášajú do histórie a počítadiel ďalších dní, takže
+    výsledok je rovnaký ako pri generovaní dní jeden po druhom.
+    Vráti zoznam dvojíc (dátum, [(task_id, [member_ids])]).
+    """
+    member_ids = snapshot.member_ids
+    tasks = snapshot.tasks
+    history = snapshot.history
+    member_totals = Counter(snapshot.member_totals)
+    pair_totals = snapshot.pair_totals.copy()
+    search = get_search_strategy(search_strategy)
+
+    day_assignments = []
+    for target_date in dates:
+        # História sa počas generovania dňa nemení, stačí jedna kontrola
+        combinations_exhausted = are_combinations_exhausted(history, member_ids, tasks)
+
+        # Rotuj poradie úloh a členov pre lepšiu distribúciu. Každý deň má vlastný
+        # generátor náhodných čísel so stabilným seedom odvodeným od dátumu.
+        rng = random.Random(schedule_seed(target_date, combinations_exhausted, snapshot.seed))
+        rotated_members = list(member_ids)
+        rng.shuffle(rotated_members)
+
+        # Inicializuj počítadlá z počítadiel histórie pred aktuálnym dátumom
+        member_task_count = {member_id: member_totals[member_id] for member_id in member_ids}
+        member_pair_count = pair_totals.copy()
+
+        # Ak sa vyčerpali všetky unikátne kombinácie, resetuj počítadlá
+        if combinations_exhausted:
+            member_task_count = {member_id: 0 for member_id in member_ids}
+            member_pair_count = PairCountMatrix(member_ids)
+            print(f"Počítadlá pre tím {snapshot.team_name} boli resetované - vyčerpali sa všetky unikátne kombinácie.")
+
+        # Deň sa nahrádza celý, takže žiadne rozvrhy v ňom nezostávajú a sloty sú na začiatku voľné
+        state = DayState(rng, member_task_count, member_pair_count, SlotOccupancy(member_ids))
+
+        assignments = assign_tasks(tasks, rotated_members, state, history, engine_mode, search)
+
+        if combinations_exhausted:
+            print(f"Všetky unikátne kombinácie pre tím {snapshot.team_name} sa vyčerpali. Počítadlá boli resetované.")
+
+        # Prenes priradenia dňa do histórie a počítadiel pre nasledujúce dni
+        for task_id, best_members in assignments:
+            history.add_schedule(task_id, best_members)
+            for member_id in best_members:
+                member_totals[member_id] += 1
+            pair_totals.add_group(best_members)
+
+        day_assignments.append((target_date, assignments))
+
+    return day_assignments
+
+
+def repair_day(snapshot, target_date, kept_assignments, repair_tasks, engine_mode='greedy', search_strategy=None):
+    """Znova priradí len vybrané úlohy dňa, ostatné priradenia dňa zostanú
+
+    snapshot: snímka tímu pred dňom, member_ids sú len členovia dostupní pre opravu
+    kept_assignments: zachované priradenia dňa [(task_id, [member_ids])]
+    repair_tasks: TaskSpec úloh, ktoré treba obsadiť znova
+    Zachované priradenia sa započítajú do počítadiel aj obsadenosti slotov,
+    takže opravené úlohy sa hodnotia rovnakým skóre ako pri generovaní dňa.
+    Vráti nové priradenia [(task_id, [member_ids])].
+    """
+    member_ids = snapshot.member_ids
+    history = snapshot.history
+    search = get_search_strategy(search_strategy)
+    slot_of = {task.id: task.time_slot for task in snapshot.tasks}
+
+    combinations_exhausted = are_combinations_exhausted(history, member_ids, snapshot.tasks)
+    rng = random.Random(schedule_seed(target_date, combinations_exhausted, snapshot.seed))
+    rotated_members = list(member_ids)
+    rng.shuffle(rotated_members)
+
+    if combinations_exhausted:
+        member_task_count = {member_id: 0 for member_id in member_ids}
+        member_pair_count = PairCountMatrix(member_ids)
+    else:
+        member_task_count = {member_id: snapshot.member_totals.get(member_id, 0) for member_id in member_ids}
+        member_pair_count = snapshot.pair_totals.copy()
+
+    # Zachované priradenia dňa obsadzujú sloty a počítajú sa do počítadiel
+    state = DayState(rng, member_task_count, member_pair_count, SlotOccupancy(member_ids))
+    for task_id, kept_member_ids in kept_assignments:
+        for member_id in kept_member_ids:
+            state.member_task_count.setdefault(member_id, 0)
+        state.assign(slot_of.get(task_id), kept_member_ids)
+
+    return assign_tasks(repair_tasks, rotated_members, state, history, engine_mode, search)
+
+
+def are_combinations_exhausted(history, member_ids, tasks):
+    """Či sa vyčerpali všetky unikátne kombinácie členov pre všetky úlohy"""
+    if not tasks:
+        return False
+
+    # Ak je počet členov menší ako maximálny počet potrebných ľudí pre úlohu, nemôže sa vyčerpať
+    max_people_needed = max(task.people_needed for task in tasks)
+    if len(member_ids) < max_people_needed:
+        return False
+
+    # Kombinácie sú vyčerpané ak pri každej úlohe počet rôznych skupín,
+    # ktoré ju už robili, dosiahol počet všetkých možných skupín
+    return all(
+        history.is_task_exhausted(task.id, task.people_needed, member_ids)
+        for task in tasks
+    )
+
+
+def assign_tasks(tasks, rotated_members, state, history, engine_mode, search):
+    """Priradí úlohy dňa po časových slotoch a zapíše ich do stavu dňa
+
+    Vráti priradenia [(task_id, [member_ids])] v poradí, v akom vznikli.
+    """
+    assignments = []
+
+    # Zoskup úlohy podľa časových slotov
+    tasks_by_time_slot = {}
+    for task in tasks:
+        time_slot = task.time_slot
+        if time_slot not in tasks_by_time_slot:
+            tasks_by_time_slot[time_slot] = []
+        tasks_by_time_slot[time_slot].append(task)
+
+    # Spracuj úlohy podľa časových slotov
+    for time_slot in sorted(tasks_by_time_slot.keys()):
+        tasks_in_slot = tasks_by_time_slot[time_slot]
+
+        if engine_mode == 'slot':
+            # Vyrieš všetky úlohy slotu naraz ako jeden priraďovací problém
+            slot_assignments = solve_time_slot(
+                [(task.id, task.people_needed) for task in tasks_in_slot],
+                state.occupancy.available(rotated_members, time_slot),
+                state.member_task_count,
+                state.member_pair_count,
+                history,
+                search
+            )
+        else:
+            state.rng.shuffle(tasks_in_slot)  # Náhodne poradie úloh v rámci slotu
+
+        for task in tasks_in_slot:
+            # Nájdi najlepšiu kombináciu členov pre úlohu
+            if engine_mode == 'slot':
+                best_members = slot_assignments.get(task.id)
+            else:
+                best_members = find_best_member_combination(
+                    rotated_members, task, state.member_task_count, state.member_pair_count,
+                    history, state.rng, state.occupancy, time_slot, search
+                )
+
+            if best_members:
+                # Aktualizuj počítadlá úloh, párov a obsadenosť slotu
+                state.assign(time_slot, best_members)
+                assignments.append((task.id, list(best_members)))
+
+    return assignments
+
+
+def find_best_member_combination(member_ids, task, member_task_count, member_pair_count, history, rng, occupancy=None, current_time_slot=None, search=None):
+    """Nájde najlepšiu kombináciu členov pre úlohu s úplnou kontrolou párov a úloh
+
+    Pracuje s ID členov, vráti zoznam ID alebo None, ak úlohu nemožno obsadiť.
+    """
+    people_needed = task.people_needed
+
+    # Ak je zadaný časový slot, použi len členov ktorí v ňom ešte nemajú úlohu
+    if occupancy is not None and current_time_slot is not None:
+        member_ids = occupancy.available(member_ids, current_time_slot)
+
+        # Ak nie sú dostupní žiadni členovia pre tento časový slot, vráť None
+        if len(member_ids) < people_needed:
+            return None
+
+    if people_needed == 1:
+        # Pre jednu osobu - vyber člena ktorý túto úlohu ešte nerobil
+        members_without_task = [m for m in member_ids if not history.has_done_task(m, task.id)]
+
+        # Ak všetci už túto úlohu robili, vyberaj spomedzi všetkých dostupných členov
+        candidates = members_without_task or member_ids
+
+        # Najprv skús nájsť člena s najmenším počtom úloh ktorý spravodlivo rozdelí úlohy,
+        # t.j. prvého podľa skóre spravodlivosti, potom podľa počtu úloh
+        fairness = FairnessState(member_task_count)
+        best_member = min(
+            candidates,
+            key=lambda m: (fairness.score([m]), member_task_count[m])
+        )
+
+        # Ak je najlepší kandidát spravodlivý, použij ho
+        if fairness.is_fair([best_member]):
+            return [best_member]
+
+        # Inak vyber člena s najmenším počtom úloh
+        min_task_count = min(member_task_count[m] for m in candidates)
+        candidates = [m for m in candidates if member_task_count[m] == min_task_count]
+        rng.shuffle(candidates)
+        return [candidates[0]]
+
+    # Pre viac osôb - kandidáti sú len členovia ktorí túto úlohu ešte nerobili.
+    # Tým je zároveň vylúčená každá skupina ktorá už úlohu robila spolu, lebo
+    # všetci jej členovia by úlohu už robili.
+    members_without_task = [m for m in member_ids if not history.has_done_task(m, task.id)]
+
+    search = search or get_search_strategy()
+    best_combinations = search(members_without_task, people_needed, member_task_count, member_pair_count)
+
+    # Prázdna skupina (úloha pre 0 ľudí) sa za nájdenú kombináciu nepovažuje
+    if best_combinations and best_combinations[0]:
+        return list(best_combinations[0])
+
+    # Ak sa nenašla žiadna kombinácia bez opakovania, vyber skupinu s najmenším počtom úloh
+    min_task_count = min(member_task_count[m] for m in member_ids)
+    candidates = [m for m in member_ids if member_task_count[m] == min_task_count]
+    rng.shuffle(candidates)
+    # Ak je takých členov menej ako treba, doplň skupinu ďalšími dostupnými členmi
+    # podľa počtu úloh, inak by vznikol neúplný rozvrh, ktorý oprava vždy znova nahradí
+    candidates += sorted((m for m in member_ids if member_task_count[m] != min_task_count), key=member_task_count.get)
+    return candidates[:people_needed]
@@ -0,0 +1,103 @@
+import itertools
+import math
+
+
+class ScheduleHistory:
+    """Snímka histórie rozvrhov tímu pred cieľovým dátumom
+
+    Načíta sa raz pre jedno generovanie rozvrhu a všetky kontroly plánovača
+    (kto už úlohu robil, či sa vyčerpali kombinácie skupín) sa potom
+    vyhodnocujú v pamäti bez ďalších dotazov do databázy.
+
+    Členovia sú očíslovaní hustými poradovými číslami a každý historický rozvrh
+    je uložený ako bitová maska členov. Samostatná kontrola "robila už táto
+    skupina túto úlohu spolu" nie je potrebná - plánovač berie len členov,
+    ktorí úlohu ešte nerobili, a taká skupina ju spolu robiť nemohla.
+    """
+
+    def __init__(self, member_ids, task_members=(), task_groups=()):
+        # member_ids: ID členov tímu, určujú poradové čísla v bitových maskách
+        # task_members: dvojice (task_id, member_id) - kto robil ktorú úlohu pred cieľovým dátumom
+        # task_groups: dvojice (task_id, member_ids) - skupiny z histórie úloh, pre ktoré
+        #   sa môže kontrolovať vyčerpanie kombinácií (stačia úlohy, ktoré robili takmer všetci)
+        self.ordinals = {}
+        for member_id in member_ids:
+            self.ordinal(member_id)
+
+        self.task_member_masks = {}
+        for task_id, member_id in task_members:
+            self.task_member_masks[task_id] = self.task_member_masks.get(task_id, 0) | self.mask_of((member_id,))
+
+        self.task_group_masks = {}
+        for task_id, group_member_ids in task_groups:
+            self.task_group_masks.setdefault(task_id, []).append(self.mask_of(group_member_ids))
+
+        self._used_group_counts = {}
+
+    def add_schedule(self, task_id, member_ids):
+        """Pridá rozvrh do histórie"""
+        mask = self.mask_of(member_ids)
+        self.task_member_masks[task_id] = self.task_member_masks.get(task_id, 0) | mask
+        self.task_group_masks.setdefault(task_id, []).append(mask)
+        self._used_group_counts.clear()
+
+    def ordinal(self, member_id):
+        """Vráti poradové číslo člena (neznámym členom pridelí nové)"""
+        ordinal = self.ordinals.get(member_id)
+        if ordinal is None:
+            ordinal = self.ordinals[member_id] = len(self.ordinals)
+        return ordinal
+
+    def mask_of(self, member_ids):
+        """Bitová maska skupiny členov"""
+        mask = 0
+        for member_id in member_ids:
+            mask |= 1 << self.ordinal(member_id)
+        return mask
+
+    def has_done_task(self, member_id, task_id):
+        """Či člen robil úlohu pred cieľovým dátumom"""
+        return bool(self.task_member_masks.get(task_id, 0) >> self.ordinal(member_id) & 1)
+
+    def used_group_count(self, task_id, size, member_ids):
+        """Počet rôznych skupín danej veľkosti zo zadaných členov, ktoré už úlohu robili spolu
+
+        Stačí jeden prechod históriou úlohy, výsledok sa pamätá pre celé generovanie.
+        """
+        member_mask = self.mask_of(member_ids)
+        key = (task_id, size, member_mask)
+        if key in self._used_group_counts:
+            return self._used_group_counts[key]
+
+        if size == 1:
+            count = (self.task_member_masks.get(task_id, 0) & member_mask).bit_count()
+        else:
+            used_groups = set()
+            for past in self.task_group_masks.get(task_id, ()):
+                past &= member_mask
+                if past.bit_count() == size:
+                    used_groups.add(past)
+                else:
+                    used_groups.update(_submasks(past, size))
+            count = len(used_groups)
+
+        self._used_group_counts[key] = count
+        return count
+
+    def is_task_exhausted(self, task_id, size, member_ids):
+        """Či už úlohu robili všetky možné skupiny danej veľkosti"""
+        member_mask = self.mask_of(member_ids)
+        if 1 <= size <= len(member_ids) and (self.task_member_masks.get(task_id, 0) & member_mask) != member_mask:
+            # Skupiny s členom, ktorý úlohu ešte nerobil, sú určite nepoužité
+            return False
+        return self.used_group_count(task_id, size, member_ids) >= math.comb(len(member_ids), size)
+
+
+def _submasks(mask, size):
+    """Všetky podmnožiny masky s daným počtom bitov"""
+    bits = [bit for bit in range(mask.bit_length()) if mask >> bit & 1]
+    for subset in itertools.combinations(bits, size):
+        submask = 0
+        for bit in subset:
+            submask |= 1 << bit
+        yield submask
@@ -0,0 +1,36 @@
+class SlotOccupancy:
+    """Obsadenosť časových slotov jedného dňa počas generovania rozvrhu
+
+    Pre každý časový slot drží bitovú masku členov, ktorí v ňom už majú úlohu.
+    Naplní sa z rozvrhov, ktoré v daný deň zostávajú, a plánovač ju dopĺňa
+    po každom priradení úlohy, takže kontrola obsadenosti nepotrebuje databázu.
+    """
+
+    def __init__(self, member_ids=(), slot_assignments=()):
+        # member_ids: ID členov tímu, určujú poradové čísla v bitových maskách
+        # slot_assignments: dvojice (time_slot, member_id) z rozvrhov, ktoré v daný deň zostávajú
+        self.ordinals = {}
+        for member_id in member_ids:
+            self._bit(member_id)
+
+        self.slot_masks = {}
+        for time_slot, member_id in slot_assignments:
+            self.slot_masks[time_slot] = self.slot_masks.get(time_slot, 0) | self._bit(member_id)
+
+    def _bit(self, member_id):
+        ordinal = self.ordinals.get(member_id)
+        if ordinal is None:
+            ordinal = self.ordinals[member_id] = len(self.ordinals)
+        return 1 << ordinal
+
+    def available(self, member_ids, time_slot):
+        """Členovia, ktorí v danom časovom slote ešte nemajú úlohu (v pôvodnom poradí)"""
+        occupied = self.slot_masks.get(time_slot, 0)
+        return [member_id for member_id in member_ids if not occupied & self._bit(member_id)]
+
+    def occupy(self, time_slot, member_ids):
+        """Zaznamená priradenie členov do časového slotu"""
+        mask = self.slot_masks.get(time_slot, 0)
+        for member_id in member_ids:
+            mask |= self._bit(member_id)
+        self.slot_masks[time_slot] = mask
@@ -0,0 +1,96 @@
+from array import array
+
+
+class PairCountMatrix:
+    """Počty spoločných úloh dvojíc členov v trojuholníkovom poli
+
+    Členovia dostanú husté poradové čísla a počet dvojice s poradovými číslami
+    i < j je na indexe j*(j-1)/2 + i v jednom poli typu array. Čítanie ani zápis
+    nevytvára kľúče ani n-tice a pamäť je n*(n-1)/2 celých čísel.
+    """
+
+    def __init__(self, member_ids=()):
+        self.ordinals = {}
+        self.counts = array('q')
+        # Odvodená podoba počtov pre iné vyhľadávania (napr. hustá NumPy matica),
+        # každá zmena počtov ju zahodí
+        self.dense_cache = None
+        for member_id in member_ids:
+            self.ordinal(member_id)
+
+    @classmethod
+    def from_counts(cls, member_ids, pair_counts):
+        """Matica zo slovníka (ID člena, ID člena) -> počet"""
+        matrix = cls(member_ids)
+        for (first_id, second_id), count in pair_counts.items():
+            if count:
+                matrix.add(first_id, second_id, count)
+        return matrix
+
+    def copy(self):
+        """Nezávislá kópia matice"""
+        matrix = PairCountMatrix()
+        matrix.ordinals = dict(self.ordinals)
+        matrix.counts = array('q', self.counts)
+        return matrix
+
+    def ordinal(self, member_id):
+        """Vráti poradové číslo člena (neznámym členom pridelí nové)"""
+        ordinal = self.ordinals.get(member_id)
+        if ordinal is None:
+            ordinal = self.ordinals[member_id] = len(self.ordinals)
+            # Nový člen tvorí dvojicu s každým doterajším
+            self.counts.frombytes(bytes(self.counts.itemsize * ordinal))
+            self.dense_cache = None
+        return ordinal
+
+    def get(self, first_id, second_id):
+        """Počet spoločných úloh dvojice (0 pre neznámych členov)"""
+        first = self.ordinals.get(first_id)
+        second = self.ordinals.get(second_id)
+        if first is None or second is None or first == second:
+            return 0
+        if first > second:
+            first, second = second, first
+        return self.counts[second * (second - 1) // 2 + first]
+
+    def add(self, first_id, second_id, amount=1):
+        """Pripočíta k počtu dvojice"""
+        first = self.ordinal(first_id)
+        second = self.ordinal(second_id)
+        if first > second:
+            first, second = second, first
+        self.counts[second * (second - 1) // 2 + first] += amount
+        self.dense_cache = None
+
+    def group_sum(self, member_ids):
+        """Súčet spoločných úloh všetkých dvojíc v skupine"""
+        ordinals = sorted(self.ordinals[member_id] for member_id in member_ids if member_id in self.ordinals)
+        counts = self.counts
+        total = 0
+        for position, second in enumerate(ordinals):
+            base = second * (second - 1) // 2
+            for first in ordinals[:position]:
+                total += counts[base + first]
+        return total
+
+    def add_group(self, member_ids, amount=1):
+        """Pripočíta spoločnú úlohu všetkým dvojiciam v skupine"""
+        ordinals = sorted(self.ordinal(member_id) for member_id in member_ids)
+        counts = self.counts
+        self.dense_cache = None
+        for position, second in enumerate(ordinals):
+            base = second * (second - 1) // 2
+            for first in ordinals[:position]:
+                counts[base + first] += amount
+
+    def items(self):
+        """Nenulové počty ako trojice (ID člena, ID člena, počet)"""
+        member_ids = list(self.ordinals)
+        counts = self.counts
+        for second in range(1, len(member_ids)):
+            base = second * (second - 1) // 2
+            for first in range(second):
+                count = counts[base + first]
+                if count:
+                    yield member_ids[first], member_ids[second], count
@@ -0,0 +1,95 @@
+class FairnessState:
+    """Histogram počtov úloh členov pre rýchle hodnotenie spravodlivosti
+
+    Drží počet členov s každým počtom úloh a zoradené rôzne počty, takže
+    otázku "aké by bolo max - min a penalizácia za členov bez úlohy, keby
+    títo členovia dostali každý o úlohu viac" zodpovie v O(k) pre skupinu
+    k rôznych členov, bez kopírovania slovníka počtov.
+    """
+
+    def __init__(self, member_task_count):
+        self.member_task_count = member_task_count
+        self.histogram = {}
+        for count in member_task_count.values():
+            self.histogram[count] = self.histogram.get(count, 0) + 1
+        self.distinct_counts = sorted(self.histogram)
+        self.max_count = self.distinct_counts[-1] if self.distinct_counts else None
+        self.below_one = sum(members for count, members in self.histogram.items() if count < 1)
+
+    def _after(self, member_ids):
+        """Vráti (min, max, počet členov s menej ako 1 úlohou) po pridaní úlohy skupine"""
+        removed = {}
+        new_min = new_max = None
+        below_one = self.below_one
+        for member_id in member_ids:
+            count = self.member_task_count.get(member_id)
+            if count is None:
+                # Člen mimo počítadiel pribudne s jednou úlohou
+                count = 0
+            else:
+                removed[count] = removed.get(count, 0) + 1
+                if count < 1:
+                    below_one -= 1
+            if count + 1 < 1:
+                below_one += 1
+            if new_min is None or count + 1 < new_min:
+                new_min = count + 1
+            if new_max is None or count + 1 > new_max:
+                new_max = count + 1
+
+        # Najmenší počet, ktorý po pridaní ešte niekto mimo skupiny má; skupina
+        # vyprázdni najviac k rôznych počtov, takže cyklus urobí najviac k+1 krokov
+        for count in self.distinct_counts:
+            if count >= new_min:
+                break
+            if self.histogram[count] > removed.get(count, 0):
+                new_min = count
+                break
+
+        if self.max_count is not None and self.max_count > new_max:
+            new_max = self.max_count
+        return new_min, new_max, below_one
+
+    def score(self, member_ids):
+        """Skóre spravodlivosti po pridaní úlohy skupine - nižšie skóre = lepšia spravodlivosť"""
+        if not member_ids:
+            return float('inf')
+
+        min_tasks, max_tasks, below_one = self._after(member_ids)
+
+        # Skóre spravodlivosti - čím menšie, tým lepšie
+        fairness_score = max_tasks - min_tasks
+
+        # Penalizuj situácie kde niekto má 3+ úlohy a niekto 0
+        if max_tasks >= 3:
+            fairness_score += below_one * 10
+
+        return fairness_score
+
+    def is_fair(self, member_ids):
+        """Či by pridanie úlohy skupine udržalo rozdelenie spravodlivé"""
+        if not member_ids:
+            return False
+
+        min_tasks, max_tasks, below_one = self._after(member_ids)
+
+        # Ak je rozdiel väčší ako 2, nie je to spravodlivé
+        if max_tasks - min_tasks > 2:
+            return False
+
+        # Ak niekto má 3+ úlohy, skontroluj či všetci ostatní majú aspoň 1
+        if max_tasks >= 3 and below_one > 0:
+            return False
+
+        return True
+
+
+def pair_count_of(member_ids, member_pair_count):
+    """Súčet spoločných úloh všetkých dvojíc v skupine (member_pair_count je PairCountMatrix)"""
+    return member_pair_count.group_sum(member_ids)
+
+
+def calculate_group_score(member_ids, member_task_count, member_pair_count):
+    """Skóre skupiny = súčet úloh všetkých členov + počet spoločných úloh (vyššia váha)"""
+    total_task_count = sum(member_task_count[member_id] for member_id in member_ids)
+    return total_task_count + pair_count_of(member_ids, member_pair_count) * 10
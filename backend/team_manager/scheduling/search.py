@@ -0,0 +1,135 @@
+import heapq
+import itertools
+
+from .scoring import FairnessState, calculate_group_score
+
+try:
+    from .vectorized import vectorized_search
+except ImportError:  # NumPy nie je nainštalovaný
+    vectorized_search = None
+
+# Stratégie hľadania skupiny pre úlohy s viacerými ľuďmi. Všetky vracajú
+# rovnaké poradie víťazov: podľa skóre spravodlivosti, potom podľa skóre
+# skupiny a pri zhode podľa poradia kombinácie v itertools.combinations.
+DEFAULT_SEARCH_STRATEGY = 'branch_and_bound'
+
+
+def exhaustive_search(candidate_ids, people_needed, member_task_count, member_pair_count, top_k=1):
+    """Referenčný režim - ohodnotí všetky kombinácie a zoradí ich"""
+    fairness = FairnessState(member_task_count)
+    all_combinations = []
+    for combination in itertools.combinations(candidate_ids, people_needed):
+        combination = list(combination)
+        fairness_score = fairness.score(combination)
+        score = calculate_group_score(combination, member_task_count, member_pair_count)
+        all_combinations.append((fairness_score, score, combination))
+
+    # Zoraď podľa skóre spravodlivosti (primárne), potom podľa skóre úloh (sekundárne).
+    # Spravodlivé sú práve kombinácie so skóre spravodlivosti najviac 2, takže prvá
+    # spravodlivá kombinácia aj kombinácia s najlepším skóre sú vždy na začiatku zoznamu.
+    all_combinations.sort(key=lambda x: (x[0], x[1]))
+    return [combination for fairness_score, score, combination in all_combinations[:top_k]]
+
+
+def branch_and_bound_search(candidate_ids, people_needed, member_task_count, member_pair_count, top_k=1):
+    """Prehľadávanie kombinácií do hĺbky s orezávaním podľa dolných odhadov skóre
+
+    Kombinácie sa prechádzajú v rovnakom poradí ako v itertools.combinations,
+    takže pri zhode skóre vyhrá tá istá kombinácia ako v referenčnom režime.
+    Vetva sa oreže, ak dolný odhad (spravodlivosť, skóre) žiadneho jej doplnenia
+    nemôže byť lepší ako najhorší z doteraz nájdených top_k výsledkov.
+    """
+    candidate_count = len(candidate_ids)
+    if people_needed < 1 or candidate_count < people_needed or not member_task_count:
+        return exhaustive_search(candidate_ids, people_needed, member_task_count, member_pair_count, top_k)
+
+    fairness = FairnessState(member_task_count)
+    counts = [member_task_count[member_id] for member_id in candidate_ids]
+    max_count = max(member_task_count.values())
+    zero_count = sum(1 for count in member_task_count.values() if count == 0)
+    ascending_members = sorted(member_task_count, key=member_task_count.get)
+
+    # Súčty najmenších počtov úloh v každom zvyšku zoznamu kandidátov
+    suffix_smallest = []
+    for start in range(candidate_count + 1):
+        suffix_smallest.append([0] + list(itertools.accumulate(sorted(counts[start:]))))
+
+    def lower_bound(chosen, chosen_max, chosen_min, chosen_zeros, load, next_index):
+        remaining = people_needed - len(chosen)
+
+        # Maximum po pridaní úlohy je aspoň doterajšie maximum tímu
+        new_max = max(max_count, chosen_max + 1)
+
+        # Minimum po pridaní úlohy je najviac (remaining+1)-tý najmenší počet mimo vybraných,
+        # lebo aspoň jeden z týchto členov zostane mimo skupiny
+        new_min = chosen_min + 1
+        skipped = 0
+        for member_id in ascending_members:
+            if member_id in chosen:
+                continue
+            if skipped == remaining:
+                new_min = min(new_min, member_task_count[member_id])
+                break
+            skipped += 1
+
+        fairness_bound = new_max - new_min
+        if new_max >= 3:
+            fairness_bound += max(0, zero_count - chosen_zeros - remaining) * 10
+
+        load_bound = load + suffix_smallest[next_index][remaining]
+        return fairness_bound, load_bound
+
+    # Max-halda najlepších nájdených výsledkov: (-spravodlivosť, -skóre, -poradie, kombinácia)
+    best = []
+    sequence = itertools.count()
+
+    def search(chosen, chosen_max, chosen_min, chosen_zeros, load, next_index):
+        if len(chosen) == people_needed:
+            combination = list(chosen)
+            entry = (
+                -fairness.score(combination),
+                -calculate_group_score(combination, member_task_count, member_pair_count),
+                -next(sequence),
+                combination
+            )
+            if len(best) < top_k:
+                heapq.heappush(best, entry)
+            elif entry > best[0]:
+                heapq.heapreplace(best, entry)
+            return
+
+        last_index = candidate_count - (people_needed - len(chosen))
+        for index in range(next_index, last_index + 1):
+            member_id = candidate_ids[index]
+            count = counts[index]
+            child_load = load + count + 10 * sum(member_pair_count.get(other_id, member_id) for other_id in chosen)
+            child = chosen + (member_id,)
+            child_max = max(chosen_max, count)
+            child_min = min(chosen_min, count)
+            child_zeros = chosen_zeros + (1 if count == 0 else 0)
+
+            if len(best) == top_k:
+                bound = lower_bound(child, child_max, child_min, child_zeros, child_load, index + 1)
+                if bound >= (-best[0][0], -best[0][1]):
+                    continue
+
+            search(child, child_max, child_min, child_zeros, child_load, index + 1)
+
+    search((), -1, float('inf'), 0, 0, 0)
+    return [entry[3] for entry in sorted(best, reverse=True)]
+
+
+SEARCH_STRATEGIES = {
+    'exhaustive': exhaustive_search,
+    'branch_and_bound': branch_and_bound_search,
+}
+if vectorized_search is not None:
+    SEARCH_STRATEGIES['numpy'] = vectorized_search
+
+
+def get_search_strategy(name=None):
+    """Vráti funkciu stratégie hľadania podľa názvu"""
+    name = name or DEFAULT_SEARCH_STRATEGY
+    if name not in SEARCH_STRATEGIES:
+        raise ValueError(f'Neznáma stratégia hľadania: {name}')
+    return SEARCH_STRATEGIES[name]
@@ -0,0 +1,26 @@
+class DayState:
+    """Stav generovania jedného dňa
+
+    Drží všetko, čo sa počas generovania dňa mení: vlastný generátor náhodných
+    čísel, počty úloh členov, počty spoločných úloh dvojíc a obsadenosť
+    časových slotov. Plánovač nepoužíva žiadny globálny stav, takže súbežné
+    generovania (vlákna, ASGI) sa navzájom neovplyvnia a výsledok závisí
+    len od vstupov a seedu.
+    """
+
+    def __init__(self, rng, member_task_count, member_pair_count, occupancy):
+        # rng: random.Random pre toto generovanie
+        # member_task_count: ID člena -> počet úloh
+        # member_pair_count: PairCountMatrix - počty spoločných úloh dvojíc
+        # occupancy: SlotOccupancy pre generovaný deň
+        self.rng = rng
+        self.member_task_count = member_task_count
+        self.member_pair_count = member_pair_count
+        self.occupancy = occupancy
+
+    def assign(self, time_slot, member_ids):
+        """Zaznamená priradenie úlohy členom do počítadiel a obsadenosti slotu"""
+        self.occupancy.occupy(time_slot, member_ids)
+        for member_id in member_ids:
+            self.member_task_count[member_id] += 1
+        self.member_pair_count.add_group(member_ids)
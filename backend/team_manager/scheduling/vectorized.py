@@ -0,0 +1,103 @@
+import heapq
+import itertools
+
+import numpy as np
+
+# Počet kombinácií ohodnotených jedným volaním NumPy
+BATCH_SIZE = 4096
+
+
+def vectorized_search(candidate_ids, people_needed, member_task_count, member_pair_count, top_k=1):
+    """Ohodnotí všetky kombinácie po dávkach cez NumPy
+
+    Počty úloh sú vektor a počty spoločných úloh hustá matica indexovaná
+    poradovým číslom člena, skupiny sú matice indexov (dávka x people_needed).
+    Skóre aj poradie víťazov sú zhodné s referenčným režimom.
+    """
+    if people_needed < 1 or len(candidate_ids) < people_needed or not member_task_count:
+        from .search import exhaustive_search
+        return exhaustive_search(candidate_ids, people_needed, member_task_count, member_pair_count, top_k)
+
+    member_ids = list(member_task_count)
+    ordinals = {member_id: ordinal for ordinal, member_id in enumerate(member_ids)}
+    counts = np.array([member_task_count[member_id] for member_id in member_ids], dtype=np.int64)
+
+    # Riadky a stĺpce hustej matice stavu pre členov z počítadiel úloh
+    matrix_ordinals = np.array([member_pair_count.ordinal(member_id) for member_id in member_ids], dtype=np.intp)
+    pair_matrix = dense_pair_counts(member_pair_count)[np.ix_(matrix_ordinals, matrix_ordinals)]
+
+    candidates = np.array([ordinals[member_id] for member_id in candidate_ids], dtype=np.intp)
+
+    # Maximum a minimum mimo skupiny sa nájde medzi people_needed+1 krajnými členmi,
+    # lebo aspoň jeden z nich do skupiny nepatrí
+    order = np.argsort(counts, kind='stable')
+    lowest = order[:people_needed + 1]
+    highest = order[::-1][:people_needed + 1]
+    zero_total = int((counts == 0).sum())
+    position_pairs = list(itertools.combinations(range(people_needed), 2))
+
+    best = []
+    combinations = itertools.combinations(range(len(candidate_ids)), people_needed)
+    offset = 0
+    while True:
+        flat = np.fromiter(
+            itertools.chain.from_iterable(itertools.islice(combinations, BATCH_SIZE)),
+            dtype=np.intp
+        )
+        if not flat.size:
+            break
+        groups = candidates[flat.reshape(-1, people_needed)]
+        group_counts = counts[groups]
+
+        new_max = _outside_extreme(groups, highest, counts, fill=-1)
+        new_max = np.maximum(new_max, group_counts.max(axis=1) + 1)
+        new_min = _outside_extreme(groups, lowest, counts, fill=np.iinfo(np.int64).max)
+        new_min = np.minimum(new_min, group_counts.min(axis=1) + 1)
+
+        # Penalizuj situácie kde niekto má 3+ úlohy a niekto 0
+        zeros_left = zero_total - (group_counts == 0).sum(axis=1)
+        fairness = new_max - new_min + np.where(new_max >= 3, zeros_left * 10, 0)
+
+        pair_sum = np.zeros(len(groups), dtype=np.int64)
+        for first, second in position_pairs:
+            pair_sum += pair_matrix[groups[:, first], groups[:, second]]
+        score = group_counts.sum(axis=1) + pair_sum * 10
+
+        # Najlepšie kombinácie dávky zlúč s doteraz najlepšími (pri zhode vyhrá skoršia)
+        sequence = np.arange(offset, offset + len(groups))
+        batch_best = [
+            (int(fairness[row]), int(score[row]), int(sequence[row]), groups[row])
+            for row in np.lexsort((sequence, score, fairness))[:top_k]
+        ]
+        best = heapq.nsmallest(top_k, best + batch_best, key=lambda entry: entry[:3])
+        offset += len(groups)
+
+    return [[member_ids[ordinal] for ordinal in entry[3]] for entry in best]
+
+
+def dense_pair_counts(member_pair_count):
+    """Hustá symetrická matica počtov dvojíc v poradí členov PairCountMatrix
+
+    Zostaví sa z trojuholníkového poľa bez cyklu v Pythone a pamätá sa
+    v matici, kým sa počty nezmenia - raz pre každý stav dňa, nie pri
+    každom hľadaní skupiny.
+    """
+    if member_pair_count.dense_cache is None:
+        size = len(member_pair_count.ordinals)
+        # Poradie np.tril_indices (riadok j, stĺpec i < j) je poradie trojuholníkového poľa
+        rows, columns = np.tril_indices(size, -1)
+        values = np.frombuffer(member_pair_count.counts, dtype=np.int64)
+        dense = np.zeros((size, size), dtype=np.int64)
+        dense[rows, columns] = values
+        dense[columns, rows] = values
+        member_pair_count.dense_cache = dense
+    return member_pair_count.dense_cache
+
+
+def _outside_extreme(groups, extremes, counts, fill):
+    """Počet úloh prvého z krajných členov, ktorý nie je v skupine"""
+    in_group = (groups[:, :, None] == extremes[None, None, :]).any(axis=1)
+    outside = ~in_group
+    first_outside = outside.argmax(axis=1)
+    values = counts[extremes][first_outside]
+    return np.where(outside.any(axis=1), values, fill)
@@ -1,3 +1,728 @@
-from django.test import TestCase
+import csv
+import io
+import itertools
+import json
+import random
+import unittest
+from unittest import mock
+from datetime import date, timedelta
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from . import response_cache
+from .counters import rebuild_team_counters
+from .generation import generate_team_schedules, repair_team_schedule
+from .jobs import claim_next_job, fail_stale_jobs, run_job, run_pending_jobs
+from .models import Team, TeamMember, Task, TaskSchedule, ScheduleJob, MemberCounter, MemberTaskCounter, MemberPairCounter
+from .scheduling import ScheduleHistory, ScheduleSnapshot, TaskSpec, generate_days
+from .scheduling.assignment import hungarian, lexicographic_costs, solve_time_slot
+from .scheduling.engine import find_best_member_combination
+from .scheduling.pairs import PairCountMatrix
+from .scheduling.scoring import FairnessState
+from .scheduling.search import branch_and_bound_search, exhaustive_search, vectorized_search
+from .views import decode_schedule_cursor, encode_schedule_cursor, tokenize_task_line
+
+# Testy nezdieľajú súborovú cache s bežiacou aplikáciou ani s inými behmi testov
+TEST_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+def reference_after(member_ids, member_task_count):
+    """Počty úloh po pridaní úlohy skupine - pôvodný výpočet cez kópiu slovníka"""
+    counts = member_task_count.copy()
+    for member_id in member_ids:
+        counts[member_id] = counts.get(member_id, 0) + 1
+    return counts
+
+
+def reference_score(member_ids, member_task_count):
+    """Pôvodné skóre spravodlivosti cez kópiu počtov"""
+    if not member_ids:
+        return float('inf')
+    counts = reference_after(member_ids, member_task_count)
+    max_tasks = max(counts.values())
+    min_tasks = min(counts.values())
+    fairness_score = max_tasks - min_tasks
+    if max_tasks >= 3:
+        fairness_score += sum(1 for count in counts.values() if count < 1) * 10
+    return fairness_score
+
+
+def reference_is_fair(member_ids, member_task_count):
+    """Pôvodná kontrola spravodlivosti cez kópiu počtov"""
+    if not member_ids:
+        return False
+    counts = reference_after(member_ids, member_task_count)
+    max_tasks = max(counts.values())
+    min_tasks = min(counts.values())
+    if max_tasks - min_tasks > 2:
+        return False
+    if max_tasks >= 3 and any(count < 1 for count in counts.values()):
+        return False
+    return True
+
+
+def create_team(member_count=8, task_count=5, name='Tím'):
+    """Tím s členmi a úlohami pre 1 až 3 ľudí v dvoch časových slotoch"""
+    team = Team.objects.create(name=name, team_password=f'{name}-heslo', admin_password='admin')
+    TeamMember.objects.bulk_create([TeamMember(team=team, name=f'Člen {index}') for index in range(member_count)])
+    for index in range(task_count):
+        Task.objects.create(team=team, name=f'Úloha {index}', people_needed=1 + index % 3, time_slot=1 + index % 2)
+    return team
+
+
+def team_members_and_tasks(team):
+    """Aktívni členovia a úlohy tímu v poradí, v akom ich berie generovanie"""
+    return list(team.members.all()), list(team.tasks.filter(is_deleted=False))
+
+
+def without_ids(schedules):
+    """Rozvrhy z odpovede generovania bez ID riadkov"""
+    return [{key: value for key, value in schedule.items() if key != 'id'} for schedule in schedules]
+
+
+def counter_rows(team):
+    """Obsah všetkých počítadiel tímu bez nulových riadkov"""
+    return (
+        sorted(MemberCounter.objects.filter(team=team, task_count__gt=0).values_list('member_id', 'task_count')),
+        sorted(MemberTaskCounter.objects.filter(team=team, count__gt=0).values_list('member_id', 'task_id', 'count')),
+        sorted(MemberPairCounter.objects.filter(team=team, count__gt=0).values_list('member_low_id', 'member_high_id', 'count')),
+    )
+
+
+def random_case(rng):
+    """Náhodní kandidáti, počty úloh a počty dvojíc pre porovnanie stratégií"""
+    member_ids = list(range(100, 100 + rng.randint(1, 10)))
+    rng.shuffle(member_ids)
+    member_task_count = {member_id: rng.choice([0, 0, 1, 2, 3, 4, 5]) for member_id in member_ids}
+    pair_counts = {
+        pair: rng.randint(0, 3)
+        for pair in itertools.combinations(sorted(member_ids), 2)
+        if rng.random() < 0.4
+    }
+    member_pair_count = PairCountMatrix.from_counts(member_ids, pair_counts)
+    candidate_ids = [member_id for member_id in member_ids if rng.random() < 0.8]
+    return candidate_ids, rng.randint(1, 4), member_task_count, member_pair_count
+
+
+def synthetic_snapshot():
+    """Snímka tímu s 12 členmi, 6 úlohami a náhodnou históriou"""
+    rng = random.Random(3)
+    member_ids = list(range(1, 13))
+    tasks = [TaskSpec(100 + index, 1 + index % 3, 1 + index % 2) for index in range(6)]
+    groups = [(task.id, sorted(rng.sample(member_ids, task.people_needed))) for task in tasks for _ in range(4)]
+    member_totals = {member_id: 0 for member_id in member_ids}
+    pair_totals = PairCountMatrix(member_ids)
+    for task_id, group in groups:
+        for member_id in group:
+            member_totals[member_id] += 1
+        pair_totals.add_group(group)
+    history = ScheduleHistory(
+        member_ids,
+        sorted({(task_id, member_id) for task_id, group in groups for member_id in group}),
+        groups
+    )
+    return ScheduleSnapshot(member_ids, tasks, history, member_totals, pair_totals, team_name='Test')
+
+
+class SearchStrategyTests(SimpleTestCase):
+    """Rýchlejšie stratégie musia vybrať tie isté skupiny v tom istom poradí ako referenčná"""
+
+    def assert_same_as_exhaustive(self, search):
+        rng = random.Random(1)
+        for trial in range(300):
+            candidate_ids, people_needed, member_task_count, member_pair_count = random_case(rng)
+            for top_k in (1, 3):
+                with self.subTest(trial=trial, top_k=top_k):
+                    self.assertEqual(
+                        search(candidate_ids, people_needed, member_task_count, member_pair_count, top_k),
+                        exhaustive_search(candidate_ids, people_needed, member_task_count, member_pair_count, top_k)
+                    )
+
+    def test_branch_and_bound_matches_exhaustive(self):
+        self.assert_same_as_exhaustive(branch_and_bound_search)
+
+    @unittest.skipIf(vectorized_search is None, 'NumPy nie je nainštalovaný')
+    def test_numpy_matches_exhaustive(self):
+        self.assert_same_as_exhaustive(vectorized_search)
+
+    @unittest.skipIf(vectorized_search is None, 'NumPy nie je nainštalovaný')
+    def test_numpy_sees_pair_count_updates(self):
+        # Hustá matica dvojíc sa ukladá, po pridaní dvojice sa musí zostaviť znova
+        member_task_count = {1: 0, 2: 0, 3: 0}
+        member_pair_count = PairCountMatrix.from_counts([1, 2, 3], {})
+        self.assertEqual(vectorized_search([1, 2, 3], 2, member_task_count, member_pair_count), [[1, 2]])
+        member_pair_count.add(1, 2)
+        self.assertEqual(vectorized_search([1, 2, 3], 2, member_task_count, member_pair_count), [[1, 3]])
+
+    def test_generated_days_do_not_depend_on_strategy(self):
+        # Celý plánovač nad viacerými dňami - každá stratégia dá rovnaký rozvrh
+        dates = [date(2025, 1, 1) + timedelta(days=offset) for offset in range(10)]
+        strategies = ['exhaustive', 'branch_and_bound'] + (['numpy'] if vectorized_search else [])
+        for engine_mode in ('greedy', 'slot'):
+            expected = generate_days(synthetic_snapshot(), dates, engine_mode, 'exhaustive')
+            for strategy in strategies[1:]:
+                with self.subTest(engine_mode=engine_mode, strategy=strategy):
+                    self.assertEqual(generate_days(synthetic_snapshot(), dates, engine_mode, strategy), expected)
+
+
+class FairnessStateTests(SimpleTestCase):
+    """FairnessState musí dávať rovnaké výsledky ako výpočet cez kópiu počtov"""
+
+    def test_matches_copy_based_scoring(self):
+        rng = random.Random(2)
+        for trial in range(500):
+            member_ids = list(range(rng.randint(0, 8)))
+            member_task_count = {member_id: rng.randint(0, 5) for member_id in member_ids}
+            # Skupina môže obsahovať aj člena mimo počítadiel
+            group = rng.sample(member_ids + [99], rng.randint(0, min(4, len(member_ids) + 1)))
+            fairness = FairnessState(member_task_count)
+            with self.subTest(trial=trial, group=group):
+                self.assertEqual(fairness.score(group), reference_score(group, member_task_count))
+                self.assertEqual(fairness.is_fair(group), reference_is_fair(group, member_task_count))
+
+
+@override_settings(CACHES=TEST_CACHES)
+class ScheduleCursorTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.team = Team.objects.create(name='Tím', team_password='heslo', admin_password='admin')
+        members = [TeamMember.objects.create(team=cls.team, name=f'Člen {index}') for index in range(3)]
+        tasks = [
+            Task.objects.create(team=cls.team, name=f'Úloha {index}', time_slot=1 + index % 2)
+            for index in range(3)
+        ]
+        for day in range(1, 6):
+            for task in tasks:
+                schedule = TaskSchedule.objects.create(team=cls.team, task=task, date=date(2025, 1, day))
+                schedule.members.set(members[day % 3:day % 3 + 1])
+
+    def get_schedule(self, **data):
+        response = self.client.post('/api/get-schedule/', json.dumps({'team_password': 'heslo', **data}), content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_cursor_round_trip(self):
+        schedule = TaskSchedule.objects.select_related('task').first()
+        self.assertEqual(
+            decode_schedule_cursor(encode_schedule_cursor(schedule)),
+            (schedule.date, schedule.task.time_slot, schedule.id)
+        )
+
+    def test_pages_match_full_read(self):
+        full = self.get_schedule()
+        self.assertIsNone(full['next_cursor'])
+        self.assertEqual(len(full['schedules']), 15)
+
+        paged = []
+        cursor = None
+        while True:
+            page = self.get_schedule(limit=4, cursor=cursor)
+            self.assertLessEqual(len(page['schedules']), 4)
+            paged += page['schedules']
+            cursor = page['next_cursor']
+            if not cursor:
+                break
+        self.assertEqual(paged, full['schedules'])
+
+    def test_date_window(self):
+        schedules = self.get_schedule(date_from='2025-01-02', date_to='2025-01-03')['schedules']
+        self.assertEqual({schedule['date'] for schedule in schedules}, {'2025-01-02', '2025-01-03'})
+
+    def test_invalid_cursor(self):
+        response = self.client.post('/api/get-schedule/', json.dumps({'team_password': 'heslo', 'cursor': 'zzz'}), content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+
+class TokenizeTaskLineTests(SimpleTestCase):
+    def assert_tokens(self, line, name, people_needed=1, description='', time_slot=1):
+        self.assertEqual(tokenize_task_line(line), {
+            'name': name,
+            'people_needed': people_needed,
+            'description': description,
+            'time_slot': time_slot
+        })
+
+    def test_full_line(self):
+        self.assert_tokens('Frontend (2) - Vývoj UI - 1', 'Frontend', 2, 'Vývoj UI', 1)
+
+    def test_optional_parts(self):
+        self.assert_tokens('Jednoduchá', 'Jednoduchá')
+        self.assert_tokens('Umývanie (3)', 'Umývanie', 3)
+        self.assert_tokens('Check-in (2) - 3', 'Check-in', 2, '', 3)
+        self.assert_tokens('Úloha (2)-Popis', 'Úloha', 2, 'Popis')
+        self.assert_tokens('Y (2) - 2024 plán', 'Y', 2, '2024 plán')
+
+    def test_dashes_and_brackets(self):
+        self.assert_tokens('Upratovanie (kuchyňa) (2) - Popis s - pomlčkou - 4', 'Upratovanie (kuchyňa)', 2, 'Popis s - pomlčkou', 4)
+        self.assert_tokens('Umývanie - riad (2) - popis - 3', 'Umývanie - riad', 2, 'popis', 3)
+        self.assert_tokens('A (2) - popis (pozri nižšie) - 2', 'A', 2, 'popis (pozri nižšie)', 2)
+
+    def test_invalid_lines(self):
+        for line in ['Upratovanie (kuchyňa)', 'A (0)', 'B (2', 'C) (2)', 'D (2) - 9', '(2) - popis']:
+            with self.subTest(line=line):
+                with self.assertRaises(ValueError):
+                    tokenize_task_line(line)
+
+
+@override_settings(CACHES=TEST_CACHES)
+class ImportTasksTests(TestCase):
+    def setUp(self):
+        self.team = Team.objects.create(name='Tím', team_password='heslo', admin_password='admin')
+
+    def import_tasks(self, tasks_text):
+        return self.client.post('/api/import-tasks/', json.dumps({
+            'team_id': self.team.id, 'admin_password': 'admin', 'tasks_text': tasks_text
+        }), content_type='application/json')
+
+    def test_creates_restores_and_skips(self):
+        Task.objects.create(team=self.team, name='Stará', is_deleted=True, people_needed=5)
+        Task.objects.create(team=self.team, name='Aktívna')
+        response = self.import_tasks('Nová (2) - popis - 3\nStará (2) - obnovená\nAktívna (1)')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['skipped'], 1)
+        self.assertEqual(
+            sorted(self.team.tasks.filter(is_deleted=False).values_list('name', 'people_needed', 'description', 'time_slot')),
+            [('Aktívna', 1, '', 1), ('Nová', 2, 'popis', 3), ('Stará', 2, 'obnovená', 1)]
+        )
+
+    def test_invalid_lines_import_nothing(self):
+        response = self.import_tasks('Dobrá (2)\nZlá (x)')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([error['line'] for error in response.json()['errors']], [2])
+        self.assertFalse(self.team.tasks.exists())
+
+
+@override_settings(CACHES=TEST_CACHES)
+class ImportMembersTests(TestCase):
+    def import_file(self, team, name, content, content_type='text/csv'):
+        upload = SimpleUploadedFile(name, content, content_type=content_type)
+        return self.client.post('/api/import-members/', {'team_id': team.id, 'admin_password': 'admin', 'file': upload})
+
+    def test_csv_upload_skips_header_and_existing_names(self):
+        team = create_team(member_count=2)
+        response = self.import_file(team, 'clenovia.csv', 'meno,poznámka\nČlen 1,\nNový A,x\n"Nový, B",\n'.encode('utf-8-sig'))
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual([member['name'] for member in data['members']], ['Nový A', 'Nový, B'])
+        self.assertEqual((data['total_added'], data['skipped']), (2, 1))
+        self.assertEqual(
+            sorted(team.members.values_list('name', flat=True)),
+            ['Nový A', 'Nový, B', 'Člen 0', 'Člen 1']
+        )
+
+    def test_text_upload_takes_whole_lines(self):
+        team = create_team(member_count=0)
+        response = self.import_file(team, 'clenovia.txt', 'meno\nAna, Bea\n\n'.encode('utf-8'), 'text/plain')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(sorted(team.members.values_list('name', flat=True)), ['Ana, Bea', 'meno'])
+
+    def test_upload_with_only_existing_names_is_rejected(self):
+        team = create_team(member_count=2)
+        response = self.import_file(team, 'clenovia.csv', 'Člen 0\nČlen 1\n'.encode('utf-8'))
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(team.members.count(), 2)
+
+
+@override_settings(CACHES=TEST_CACHES)
+class CounterTests(TestCase):
+    """Počítadlá menené po kúskoch sa musia zhodovať s prepočtom z celej histórie"""
+
+    def assert_counters_match_rebuild(self, team):
+        incremental = counter_rows(team)
+        rebuild_team_counters(team)
+        self.assertEqual(incremental, counter_rows(team))
+
+    def test_generate_regenerate_and_repair(self):
+        team = create_team()
+        members, tasks = team_members_and_tasks(team)
+        generate_team_schedules(team, members, tasks, date(2025, 1, 1), date(2025, 1, 7), 'greedy')
+        self.assert_counters_match_rebuild(team)
+
+        # Prekrývajúci sa rozsah nahradí existujúce dni
+        generate_team_schedules(team, members, tasks, date(2025, 1, 5), date(2025, 1, 10), 'slot')
+        self.assert_counters_match_rebuild(team)
+
+        repair_team_schedule(team, members, tasks, date(2025, 1, 6), member_ids=[members[0].id])
+        self.assert_counters_match_rebuild(team)
+
+    def test_team_without_built_counters(self):
+        # Tím s históriou spred počítadiel si ich zostaví pri prvom zápise
+        team = create_team()
+        members, tasks = team_members_and_tasks(team)
+        for day in range(1, 4):
+            schedule = TaskSchedule.objects.create(team=team, task=tasks[0], date=date(2025, 1, day))
+            schedule.members.set(members[day:day + 1])
+        self.assertFalse(Team.objects.get(pk=team.pk).counters_built)
+
+        repair_team_schedule(team, members, tasks, date(2025, 1, 2))
+        self.assertTrue(Team.objects.get(pk=team.pk).counters_built)
+        self.assert_counters_match_rebuild(team)
+
+
+@override_settings(CACHES=TEST_CACHES)
+class RangeGenerationTests(TestCase):
+    def test_range_matches_days_one_after_another(self):
+        team = create_team(member_count=7, task_count=6)
+        members, tasks = team_members_and_tasks(team)
+        dates = [date(2025, 3, 1) + timedelta(days=offset) for offset in range(10)]
+        for engine_mode in ('greedy', 'slot'):
+            with self.subTest(engine_mode=engine_mode):
+                range_schedules, message = generate_team_schedules(team, members, tasks, dates[0], dates[-1], engine_mode)
+
+                TaskSchedule.objects.filter(team=team).delete()
+                rebuild_team_counters(team)
+                day_schedules = []
+                for target_date in dates:
+                    day_schedules += generate_team_schedules(team, members, tasks, target_date, target_date, engine_mode)[0]
+
+                self.assertEqual(without_ids(range_schedules), without_ids(day_schedules))
+                TaskSchedule.objects.filter(team=team).delete()
+                rebuild_team_counters(team)
+
+
+@override_settings(CACHES=TEST_CACHES)
+class GenerationQueryTests(TestCase):
+    def generate_next_day(self, team):
+        members, tasks = team_members_and_tasks(team)
+        generate_team_schedules(team, members, tasks, date(2025, 1, 2), date(2025, 1, 2), 'greedy')
+
+    def test_query_count_does_not_grow_with_team(self):
+        # Oba tímy majú za sebou jeden deň histórie, meria sa generovanie ďalšieho dňa
+        small_team = create_team(member_count=8, name='Malý')
+        large_team = create_team(member_count=40, name='Veľký')
+        for team in (small_team, large_team):
+            members, tasks = team_members_and_tasks(team)
+            generate_team_schedules(team, members, tasks, date(2025, 1, 1), date(2025, 1, 1), 'greedy')
+
+        with CaptureQueriesContext(connection) as small_queries:
+            self.generate_next_day(small_team)
+        with self.assertNumQueries(len(small_queries)):
+            self.generate_next_day(large_team)
+
+
+@override_settings(CACHES=TEST_CACHES)
+class DryRunTests(TestCase):
+    def setUp(self):
+        self.team = create_team()
+
+    def post(self, url, **data):
+        return self.client.post(url, json.dumps({'team_id': self.team.id, 'admin_password': 'admin', **data}), content_type='application/json')
+
+    def test_commit_writes_preview_once(self):
+        preview = self.post('/api/generate-schedule/', date_from='2025-01-01', date_to='2025-01-03', dry_run=True).json()
+        self.assertTrue(preview['dry_run'])
+        self.assertFalse(TaskSchedule.objects.filter(team=self.team).exists())
+
+        response = self.post('/api/commit-schedule/', proposal_id=preview['proposal_id'])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(without_ids(response.json()['schedules']), without_ids(preview['schedules']))
+        self.assertEqual(TaskSchedule.objects.filter(team=self.team).count(), len(preview['schedules']))
+
+        response = self.post('/api/commit-schedule/', proposal_id=preview['proposal_id'])
+        self.assertEqual(response.status_code, 409)
+
+    def test_team_change_expires_proposal(self):
+        preview = self.post('/api/generate-schedule/', date='2025-01-01', dry_run=True).json()
+        TeamMember.objects.create(team=self.team, name='Nový člen')
+        response = self.post('/api/commit-schedule/', proposal_id=preview['proposal_id'])
+        self.assertEqual(response.status_code, 409)
+        self.assertFalse(TaskSchedule.objects.filter(team=self.team).exists())
+
+
+class GroupFallbackTests(SimpleTestCase):
+    def test_fallback_fills_group(self):
+        # Všetci úlohu už robili a najmenší počet úloh má len jeden člen
+        history = ScheduleHistory([1, 2, 3], [(10, 1), (10, 2), (10, 3)])
+        group = find_best_member_combination(
+            [1, 2, 3], TaskSpec(10, 2, 1), {1: 0, 2: 1, 3: 2}, PairCountMatrix([1, 2, 3]),
+            history, random.Random(0), search=exhaustive_search
+        )
+        self.assertEqual(group, [1, 2])
+
+
+class SlotAssignmentTests(SimpleTestCase):
+    def test_repeat_is_not_traded_for_fairness(self):
+        # Členovia 1 a 2 úlohu nerobili, ale majú viac úloh ako 3 a 4, ktorí ju už robili
+        member_task_count = {1: 3, 2: 3, 3: 0, 4: 0}
+        history = ScheduleHistory([1, 2, 3, 4], [(10, 3), (10, 4)])
+        assignments = solve_time_slot(
+            [(10, 2)], [1, 2, 3, 4], member_task_count, PairCountMatrix([1, 2, 3, 4]), history, exhaustive_search
+        )
+        self.assertEqual(sorted(assignments[10]), [1, 2])
+
+    def test_lexicographic_costs_keep_tuple_order(self):
+        rng = random.Random(5)
+        for trial in range(200):
+            row_count = rng.randint(1, 4)
+            column_count = rng.randint(row_count, 5)
+            keys = [
+                [tuple(rng.randint(0, 3) for _ in range(3)) for _ in range(column_count)]
+                for _ in range(row_count)
+            ]
+            cost, unassigned_cost = lexicographic_costs(keys)
+            self.assertGreater(unassigned_cost, sum(max(row) for row in cost))
+
+            def key_total(columns):
+                return tuple(sum(keys[row][column][level] for row, column in enumerate(columns)) for level in range(3))
+
+            best = min(key_total(columns) for columns in itertools.permutations(range(column_count), row_count))
+            self.assertEqual(key_total(hungarian(cost)), best)
+
+
+@override_settings(CACHES=TEST_CACHES)
+class RepairTests(TestCase):
+    def day_rows(self, team, target_date):
+        return {
+            schedule.id: (schedule.task_id, sorted(member.id for member in schedule.members.all()))
+            for schedule in TaskSchedule.objects.filter(team=team, date=target_date).prefetch_related('members')
+        }
+
+    def test_repair_keeps_untouched_rows(self):
+        team = create_team()
+        members, tasks = team_members_and_tasks(team)
+        generate_team_schedules(team, members, tasks, date(2025, 1, 1), date(2025, 1, 5), 'greedy')
+        before = self.day_rows(team, date(2025, 1, 3))
+        victim = next(member_ids[0] for task_id, member_ids in before.values())
+
+        schedules, removed, kept = repair_team_schedule(team, members, tasks, date(2025, 1, 3), member_ids=[victim])
+        after = self.day_rows(team, date(2025, 1, 3))
+
+        untouched = {schedule_id: row for schedule_id, row in before.items() if victim not in row[1]}
+        self.assertEqual(kept, len(untouched))
+        self.assertEqual(removed, len(before) - len(untouched))
+        self.assertEqual({schedule_id: after[schedule_id] for schedule_id in untouched}, untouched)
+        self.assertFalse(any(victim in member_ids for task_id, member_ids in after.values()))
+
+    def test_repeated_repair_changes_nothing(self):
+        # Malý tím rýchlo vyčerpá kombinácie, generovanie potom siaha po náhradnej skupine
+        team = create_team(member_count=4, task_count=3)
+        members, tasks = team_members_and_tasks(team)
+        generate_team_schedules(team, members, tasks, date(2025, 1, 1), date(2025, 1, 14), 'greedy')
+        for schedule in TaskSchedule.objects.filter(team=team).select_related('task').prefetch_related('members'):
+            self.assertEqual(len(schedule.members.all()), schedule.task.people_needed)
+
+        for day in range(1, 15):
+            with self.subTest(day=day):
+                schedules, removed, kept = repair_team_schedule(team, members, tasks, date(2025, 1, day))
+                self.assertEqual((schedules, removed), ([], 0))
+
+
+@override_settings(CACHES=TEST_CACHES)
+class TeamVersionTests(TestCase):
+    def setUp(self):
+        self.team = create_team()
+        self.member = self.team.members.first()
+        self.task = self.team.tasks.first()
+        self.spare_member = TeamMember.objects.create(team=self.team, name='Bez úloh')
+
+    def version(self):
+        return Team.objects.get(pk=self.team.pk).version
+
+    def read_day(self, **headers):
+        return self.client.get('/api/get-schedule-for-date/', {'team_password': self.team.team_password, 'date': '2025-01-01'}, **headers)
+
+    def test_get_returns_etag_and_304(self):
+        response = self.read_day()
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('private', response['Cache-Control'])
+        etag = response['ETag']
+
+        self.assertEqual(self.read_day(HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        self.client.post('/api/generate-schedule/', json.dumps({
+            'team_id': self.team.id, 'admin_password': 'admin', 'date': '2025-01-01'
+        }), content_type='application/json')
+        response = self.read_day(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_post_read_has_no_etag(self):
+        response = self.client.post('/api/get-schedule-for-date/', json.dumps({
+            'team_password': self.team.team_password, 'date': '2025-01-01'
+        }), content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header('ETag'))
+
+    def test_writes_bump_version(self):
+        writes = [
+            ('post', '/api/add-member/', {'team_id': self.team.id, 'name': 'Nový'}),
+            ('put', '/api/update-member/', {'member_id': self.member.id, 'new_name': 'Premenovaný'}),
+            ('post', '/api/add-task/', {'team_id': self.team.id, 'name': 'Nová úloha'}),
+            ('put', '/api/update-task/', {'task_id': self.task.id, 'new_name': 'Upravená', 'new_description': '', 'new_people_needed': 2}),
+            ('delete', '/api/delete-member/', {'member_id': self.spare_member.id}),
+            ('post', '/api/generate-schedule/', {'team_id': self.team.id, 'date': '2025-01-02'}),
+        ]
+        for method, url, data in writes:
+            with self.subTest(url=url):
+                version = self.version()
+                response = getattr(self.client, method)(url, json.dumps({'admin_password': 'admin', **data}), content_type='application/json')
+                self.assertEqual(response.status_code, 200, response.content)
+                self.assertEqual(self.version(), version + 1)
+
+    def test_admin_edits_bump_version(self):
+        User.objects.create_superuser('admin', 'admin@example.com', 'heslo')
+        self.client.login(username='admin', password='heslo')
+        version = self.version()
+        self.client.post(f'/admin/team_manager/task/{self.task.id}/change/', {
+            'team': self.team.id, 'name': 'Z administrácie', 'description': '', 'people_needed': 1, 'time_slot': 1
+        })
+        self.assertEqual(self.version(), version + 1)
+        self.client.post(f'/admin/team_manager/teammember/{self.member.id}/delete/', {'post': 'yes'})
+        self.assertEqual(self.version(), version + 2)
+
+
+@override_settings(CACHES=TEST_CACHES)
+class ResponseCacheTests(TestCase):
+    def setUp(self):
+        self.team = create_team()
+        response_cache.flush_stats()
+        cache.clear()
+        # Tímy v ďalších testoch môžu dostať rovnaké ID, uložené odpovede nesmú prežiť test
+        self.addCleanup(cache.clear)
+
+    def read_schedule(self):
+        response = self.client.post('/api/get-schedule/', json.dumps({'team_password': self.team.team_password}), content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_write_invalidates_cached_body(self):
+        self.assertEqual(self.read_schedule()['schedules'], [])
+        self.assertEqual(self.read_schedule()['schedules'], [])
+
+        self.client.post('/api/generate-schedule/', json.dumps({
+            'team_id': self.team.id, 'admin_password': 'admin', 'date': '2025-01-01'
+        }), content_type='application/json')
+        schedules = self.read_schedule()['schedules']
+        self.assertEqual(len(schedules), TaskSchedule.objects.filter(team=self.team).count())
+        self.assertTrue(schedules)
+
+    @mock.patch.object(response_cache, 'STATS_FLUSH_INTERVAL', 3600)
+    def test_stats_are_counted_per_process(self):
+        self.read_schedule()
+        self.read_schedule()
+        # Čítania počítajú v procese a do cache nezapisujú
+        self.assertIsNone(cache.get(response_cache.STATS_KEYS['hits']))
+        self.assertIsNone(cache.get(response_cache.STATS_KEYS['misses']))
+
+        stats = response_cache.cache_stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['hit_ratio']), (1, 1, 0.5))
+
+
+@override_settings(CACHES=TEST_CACHES)
+class ExportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.team = create_team(member_count=6, task_count=4, name='Tím; export')
+        members, tasks = team_members_and_tasks(cls.team)
+        generate_team_schedules(cls.team, members, tasks, date(2025, 5, 1), date(2025, 5, 3), 'greedy')
+
+    def export(self, export_format, **data):
+        response = self.client.post('/api/export-schedule/', json.dumps({
+            'team_password': self.team.team_password, 'format': export_format, **data
+        }), content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return response, b''.join(response.streaming_content).decode('utf-8')
+
+    def member_rows(self):
+        return TaskSchedule.members.through.objects.filter(taskschedule__team=self.team).count()
+
+    def test_csv(self):
+        response, body = self.export('csv')
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        self.assertEqual(response['Content-Disposition'], f'attachment; filename="rozvrh-{self.team.id}.csv"')
+        rows = list(csv.reader(io.StringIO(body)))
+        self.assertEqual(rows[0], ['date', 'time_slot', 'task', 'people_needed', 'member'])
+        self.assertEqual(len(rows) - 1, self.member_rows())
+        self.assertEqual(rows[1:], sorted(rows[1:], key=lambda row: (row[0], int(row[1]))))
+
+    def test_ics(self):
+        response, body = self.export('ics')
+        self.assertEqual(response['Content-Type'], 'text/calendar; charset=utf-8')
+        self.assertTrue(body.startswith('BEGIN:VCALENDAR\r\n'))
+        self.assertTrue(body.endswith('END:VCALENDAR\r\n'))
+        self.assertNotIn('\n', body.replace('\r\n', ''))
+        self.assertIn('X-WR-CALNAME:Tím\\; export\r\n', body)
+        self.assertEqual(body.count('BEGIN:VEVENT'), self.member_rows())
+        self.assertTrue(all(len(line.encode('utf-8')) <= 75 for line in body.split('\r\n')))
+
+    def test_ndjson_matches_get_schedule(self):
+        response, body = self.export('ndjson', date_from='2025-05-02')
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        schedules = self.client.post('/api/get-schedule/', json.dumps({
+            'team_password': self.team.team_password, 'date_from': '2025-05-02'
+        }), content_type='application/json').json()['schedules']
+        self.assertTrue(schedules)
+        self.assertEqual([json.loads(line) for line in body.splitlines()], schedules)
+
+    def test_unknown_format(self):
+        response = self.client.post('/api/export-schedule/', json.dumps({
+            'team_password': self.team.team_password, 'format': 'xlsx'
+        }), content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+
+@override_settings(CACHES=TEST_CACHES)
+class ScheduleJobTests(TestCase):
+    def setUp(self):
+        self.team = create_team()
+
+    def enqueue(self, **data):
+        response = self.client.post('/api/generate-schedule/', json.dumps({
+            'team_id': self.team.id, 'admin_password': 'admin', 'date_from': '2025-02-01', 'date_to': '2025-02-03',
+            'async': True, **data
+        }), content_type='application/json')
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.json()['status'], ScheduleJob.STATUS_PENDING)
+        return response.json()['job_id']
+
+    def job_status(self, job_id):
+        response = self.client.post('/api/schedule-job/', json.dumps({
+            'job_id': job_id, 'admin_password': 'admin'
+        }), content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_job_runs_to_done(self):
+        job_id = self.enqueue()
+        self.assertFalse(TaskSchedule.objects.filter(team=self.team).exists())
+
+        job = claim_next_job()
+        self.assertEqual((job.id, job.status), (job_id, ScheduleJob.STATUS_RUNNING))
+        self.assertEqual(self.job_status(job_id)['status'], ScheduleJob.STATUS_RUNNING)
+        self.assertIsNone(claim_next_job())
+
+        run_job(job)
+
+        status = self.job_status(job_id)
+        self.assertEqual(status['status'], ScheduleJob.STATUS_DONE)
+        self.assertEqual(len(status['schedules']), TaskSchedule.objects.filter(team=self.team).count())
+        self.assertEqual({schedule['date'] for schedule in status['schedules']}, {'2025-02-01', '2025-02-02', '2025-02-03'})
+
+    def test_job_fails_without_tasks(self):
+        job_id = self.enqueue()
+        self.team.tasks.update(is_deleted=True)
+        self.assertEqual(run_pending_jobs(), 1)
+
+        status = self.job_status(job_id)
+        self.assertEqual(status['status'], ScheduleJob.STATUS_FAILED)
+        self.assertTrue(status['error'])
+        self.assertFalse(TaskSchedule.objects.filter(team=self.team).exists())
+
+    @override_settings(SCHEDULER_JOB_TIMEOUT=60)
+    def test_stale_running_job_fails(self):
+        stale_id = self.enqueue()
+        fresh_id = self.enqueue()
+        now = timezone.now()
+        ScheduleJob.objects.filter(id=stale_id).update(status=ScheduleJob.STATUS_RUNNING, started_at=now - timedelta(seconds=61))
+        ScheduleJob.objects.filter(id=fresh_id).update(status=ScheduleJob.STATUS_RUNNING, started_at=now)
+
+        self.assertEqual(self.job_status(stale_id)['status'], ScheduleJob.STATUS_FAILED)
+        self.assertEqual(self.job_status(fresh_id)['status'], ScheduleJob.STATUS_RUNNING)
+        self.assertEqual(fail_stale_jobs(), 0)
@@ -16,8 +16,13 @@ urlpatterns = [
     path('api/delete-task/', views.delete_task, name='delete_task'),
     path('api/restore-task/', views.restore_task, name='restore_task'),
     path('api/generate-schedule/', views.generate_schedule, name='generate_schedule'),
+    path('api/commit-schedule/', views.commit_schedule, name='commit_schedule'),
+    path('api/repair-schedule/', views.repair_schedule, name='repair_schedule'),
+    path('api/schedule-job/', views.get_schedule_job, name='schedule_job'),
     path('api/get-schedule/', views.get_team_schedule, name='get_schedule'),
     path('api/get-schedule-for-date/', views.get_team_schedule_for_date, name='get_schedule_for_date'),
+    path('api/export-schedule/', views.export_schedule, name='export_schedule'),
     path('api/get-task-details/', views.get_task_details, name='get_task_details'),
     path('api/team-info/<int:team_id>/', views.get_team_info, name='team_info'),
+    path('api/cache-stats/', views.get_response_cache_stats, name='cache_stats'),
 ]
@@ -1,22 +1,36 @@
 from django.shortcuts import render, get_object_or_404
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt
-from django.views.decorators.http import require_http_methods
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition, require_http_methods
 from django.utils.decorators import method_decorator
 from django.views import View
 from django.db import transaction
+from django.db.models import Prefetch, Q
+from django.conf import settings
 from django.utils import timezone
 from django.contrib.auth import authenticate
 from datetime import datetime, timedelta
+import base64
+import csv
+import io
 import json
 import os
-import random
-import itertools
-from .models import Team, TeamMember, Task, TaskSchedule
+from .models import Team, TeamMember, Task, TaskSchedule, ScheduleJob
+from .exports import EXPORT_FORMATS, stream_export
+from .jobs import fail_stale_jobs
+from .generation import ProposalExpired, commit_team_schedules, generate_team_schedules, propose_team_schedules, repair_team_schedule
+from .response_cache import cache_stats, cached_response_body, team_changed
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from rest_framework import status
 
+# Najväčší počet dní, ktoré možno vygenerovať jednou požiadavkou
+MAX_SCHEDULE_RANGE_DAYS = 366
+# Predvolená veľkosť stránky pri pokračovaní kurzorom bez limitu a najväčšia veľkosť stránky
+SCHEDULE_PAGE_SIZE = 500
+MAX_SCHEDULE_PAGE_SIZE = 2000
+
 @csrf_exempt
 @require_http_methods(["POST"])
 def admin_login(request):
@@ -89,6 +103,8 @@ def add_team_member(request):
         if not created:
             return JsonResponse({'error': 'Člen s týmto menom už existuje'}, status=400)
         
+        team_changed(team)
+        
         return JsonResponse({'success': True, 'member_id': member.id})
     except Exception as e:
         return JsonResponse({'error': str(e)}, status=500)
@@ -96,14 +112,20 @@ def add_team_member(request):
 @csrf_exempt
 @require_http_methods(["POST"])
 def import_team_members(request):
-    """Importuje členov tímu z textu (jeden člen na riadok)"""
+    """Importuje členov tímu z textu alebo súboru (jeden člen na riadok)"""
     try:
-        data = json.loads(request.body)
+        # JSON s members_text, alebo multipart formulár so súborom file (CSV alebo text)
+        if request.content_type == 'multipart/form-data':
+            data = request.POST
+            upload = request.FILES.get('file')
+        else:
+            data = json.loads(request.body)
+            upload = None
         team_id = data.get('team_id')
         members_text = data.get('members_text')
         admin_password = data.get('admin_password')
         
-        if not all([team_id, admin_password, members_text]):
+        if not all([team_id, admin_password]) or not (members_text or upload):
             return JsonResponse({'error': 'Všetky polia sú povinné'}, status=400)
         
         team = get_object_or_404(Team, id=team_id)
@@ -111,8 +133,11 @@ def import_team_members(request):
         if team.admin_password != admin_password:
             return JsonResponse({'error': 'Nesprávne admin heslo'}, status=401)
         
-        # Rozdel text na riadky a vyčisti
-        member_names = [name.strip() for name in members_text.split('\n') if name.strip()]
+        # Rozdel text alebo súbor na riadky a vyčisti
+        if upload:
+            member_names = list(read_member_names(upload))
+        else:
+            member_names = [name.strip() for name in members_text.split('\n') if name.strip()]
         
         if not member_names:
             return JsonResponse({'error': 'Text neobsahuje žiadne mená'}, status=400)
@@ -121,33 +146,57 @@ def import_team_members(request):
         if len(member_names) != len(set(member_names)):
             return JsonResponse({'error': 'Text obsahuje duplicitné mená'}, status=400)
         
-        # Skontroluj či už existujú
-        existing_names = set(TeamMember.objects.filter(team=team).values_list('name', flat=True))
-        new_names = [name for name in member_names if name not in existing_names]
-        
-        if not new_names:
-            return JsonResponse({'error': 'Všetci členovia už existujú'}, status=400)
+        max_length = TeamMember._meta.get_field('name').max_length
+        too_long = [name for name in member_names if len(name) > max_length]
+        if too_long:
+            return JsonResponse({'error': f'Meno môže mať najviac {max_length} znakov: {too_long[0]}'}, status=400)
         
-        # Vytvor nových členov
-        created_members = []
-        for name in new_names:
-            member = TeamMember.objects.create(team=team, name=name)
-            created_members.append({
-                'id': member.id,
-                'name': member.name
-            })
+        with transaction.atomic():
+            # Skontroluj či už existujú
+            existing_names = set(TeamMember.objects.filter(team=team).values_list('name', flat=True))
+            new_names = [name for name in member_names if name not in existing_names]
+            
+            if not new_names:
+                return JsonResponse({'error': 'Všetci členovia už existujú'}, status=400)
+            
+            # Vytvor nových členov jedným príkazom; mená, ktoré medzitým pridal
+            # súbežný import, preskočí unique_together (team, name)
+            TeamMember.objects.bulk_create(
+                [TeamMember(team=team, name=name) for name in new_names],
+                ignore_conflicts=True
+            )
+            created_members = list(
+                TeamMember.objects.filter(team=team, name__in=new_names)
+                .order_by('id')
+                .values('id', 'name')
+            )
+            team_changed(team)
         
         return JsonResponse({
             'success': True,
             'message': f'Úspešne pridaných {len(created_members)} nových členov',
             'members': created_members,
             'total_added': len(created_members),
-            'skipped': len(member_names) - len(new_names)
+            'skipped': len(member_names) - len(created_members)
         })
         
     except Exception as e:
         return JsonResponse({'error': str(e)}, status=500)
 
+def read_member_names(upload):
+    """Mená členov z nahraného súboru, čítané po riadkoch bez načítania celého súboru"""
+    # CSV berie meno z prvého stĺpca a preskočí hlavičku, iný súbor celý riadok
+    lines = io.TextIOWrapper(upload.file, encoding='utf-8-sig', newline='')
+    is_csv = upload.name.lower().endswith('.csv') or upload.content_type == 'text/csv'
+    rows = csv.reader(lines) if is_csv else ([line] for line in lines)
+    
+    for index, row in enumerate(rows):
+        name = row[0].strip() if row else ''
+        if is_csv and index == 0 and name.lower() in ('name', 'meno'):
+            continue
+        if name:
+            yield name
+
 @csrf_exempt
 @require_http_methods(["PUT"])
 def update_team_member(request):
@@ -175,6 +224,7 @@ def update_team_member(request):
         old_name = member.name
         member.name = new_name
         member.save()
+        team_changed(team)
         
         return JsonResponse({
             'success': True,
@@ -212,6 +262,7 @@ def delete_team_member(request):
         
         member_name = member.name
         member.delete()
+        team_changed(team)
         
         return JsonResponse({
             'success': True,
@@ -224,7 +275,7 @@ def delete_team_member(request):
 @csrf_exempt
 @require_http_methods(["POST"])
 def import_tasks(request):
-    """Importuje úlohy tímu z textu (formát: Názov úlohy (X) - Popis)"""
+    """Importuje úlohy tímu z textu (formát: Názov úlohy (X) - Popis - Časový slot)"""
     try:
         data = json.loads(request.body)
         team_id = data.get('team_id')
@@ -239,129 +290,72 @@ def import_tasks(request):
         if team.admin_password != admin_password:
             return JsonResponse({'error': 'Nesprávne admin heslo'}, status=400)
         
-        # Rozdel text na riadky a vyčisti
-        task_lines = [line.strip() for line in tasks_text.split('\n') if line.strip()]
-        
-        if not task_lines:
-            return JsonResponse({'error': 'Text neobsahuje žiadne úlohy'}, status=400)
-        
-        # Parsuj úlohy
+        # Parsuj úlohy, prázdne riadky preskoč, chyby zbieraj s číslom riadku;
+        # ak je niektorý riadok neplatný, neuloží sa nič
         parsed_tasks = []
-        for line in task_lines:
-            # Formát: "Názov úlohy (X) - Popis - Časový slot" alebo "Názov úlohy (X) - Časový slot"
-            if '(' in line and ')' in line:
-                # Nájdi počet ľudí v zátvorke
-                start = line.rfind('(')
-                end = line.rfind(')')
-                if start < end:
-                    people_part = line[start+1:end]
-                    try:
-                        people_needed = int(people_part)
-                        # Získaj názov, popis a časový slot
-                        name_part = line[:start].strip()
-                        remaining_part = line[end+1:].strip()
-                        
-                        # Rozdel na popis a časový slot
-                        parts = remaining_part.split('-')
-                        description_part = ''
-                        time_slot = 1  # Default časový slot
-                        
-                        if len(parts) >= 2:
-                            description_part = parts[0].strip()
-                            if len(parts) >= 3:
-                                try:
-                                    time_slot = int(parts[2].strip())
-                                    if time_slot < 1 or time_slot > 5:
-                                        time_slot = 1
-                                except ValueError:
-                                    time_slot = 1
-                        
-                        parsed_tasks.append({
-                            'name': name_part,
-                            'people_needed': people_needed,
-                            'description': description_part,
-                            'time_slot': time_slot
-                        })
-                    except ValueError:
-                        continue
-            else:
-                # Jednoduchý formát bez počtu ľudí - použije default 1
-                parsed_tasks.append({
-                    'name': line,
-                    'people_needed': 1,
-                    'description': '',
-                    'time_slot': 1
-                })
+        errors = []
+        for line_number, line in enumerate(tasks_text.split('\n'), start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                parsed_tasks.append(tokenize_task_line(line))
+            except ValueError as e:
+                errors.append({'line': line_number, 'text': line, 'error': str(e)})
+        
+        if errors:
+            summary = '; '.join(f"riadok {error['line']}: {error['error']}" for error in errors[:5])
+            return JsonResponse({'error': f'Niektoré riadky majú neplatný formát ({summary})', 'errors': errors}, status=400)
         
         if not parsed_tasks:
-            return JsonResponse({'error': 'Nepodarilo sa parsovať žiadne úlohy'}, status=400)
+            return JsonResponse({'error': 'Text neobsahuje žiadne úlohy'}, status=400)
         
         # Skontroluj duplicity v texte
         task_names = [task['name'] for task in parsed_tasks]
         if len(task_names) != len(set(task_names)):
             return JsonResponse({'error': 'Text obsahuje duplicitné názvy úloh'}, status=400)
         
-        # Skontroluj či už existujú (aj vymazané)
-        existing_tasks = Task.objects.filter(team=team)
-        existing_names = set(existing_tasks.values_list('name', flat=True))
-        
-        # Rozdel úlohy na nové a existujúce vymazané
-        new_tasks = []
-        restored_tasks = []
-        
-        for task_data in parsed_tasks:
-            if task_data['name'] not in existing_names:
-                new_tasks.append(task_data)
-            else:
-                # Skontroluj či je úloha vymazaná
-                existing_task = existing_tasks.filter(name=task_data['name']).first()
-                if existing_task and existing_task.is_deleted:
-                    restored_tasks.append((existing_task, task_data))
-        
-        if not new_tasks and not restored_tasks:
-            return JsonResponse({'error': 'Všetky úlohy už existujú'}, status=400)
-        
-        # Obnov vymazané úlohy
-        restored_tasks_data = []
-        for existing_task, task_data in restored_tasks:
-            existing_task.description = task_data['description']
-            existing_task.people_needed = task_data['people_needed']
-            existing_task.time_slot = task_data['time_slot']
-            existing_task.is_deleted = False
-            existing_task.save()
+        with transaction.atomic():
+            # Všetky úlohy tímu (aj vymazané) jedným dotazom, podľa názvu
+            existing_tasks = {task.name: task for task in Task.objects.filter(team=team)}
             
-            restored_tasks_data.append({
-                'id': existing_task.id,
-                'name': existing_task.name,
-                'description': existing_task.description,
-                'people_needed': existing_task.people_needed,
-                'time_slot': existing_task.time_slot
-            })
+            # Rozdel úlohy na nové a existujúce vymazané, existujúce aktívne preskoč
+            new_tasks = []
+            restored_tasks = []
+            for task_data in parsed_tasks:
+                existing_task = existing_tasks.get(task_data['name'])
+                if existing_task is None:
+                    new_tasks.append(Task(team=team, **task_data))
+                elif existing_task.is_deleted:
+                    existing_task.description = task_data['description']
+                    existing_task.people_needed = task_data['people_needed']
+                    existing_task.time_slot = task_data['time_slot']
+                    existing_task.is_deleted = False
+                    restored_tasks.append(existing_task)
+            
+            if not new_tasks and not restored_tasks:
+                return JsonResponse({'error': 'Všetky úlohy už existujú'}, status=400)
+            
+            # Obnov vymazané úlohy a vytvor nové - po jednom príkaze
+            Task.objects.bulk_update(restored_tasks, ['description', 'people_needed', 'time_slot', 'is_deleted'])
+            created_tasks = Task.objects.bulk_create(new_tasks)
+            team_changed(team)
         
-        # Vytvor nové úlohy
-        created_tasks = []
-        for task_data in new_tasks:
-            task = Task.objects.create(
-                team=team,
-                name=task_data['name'],
-                description=task_data['description'],
-                people_needed=task_data['people_needed'],
-                time_slot=task_data['time_slot']
-            )
-            created_tasks.append({
+        all_tasks = [
+            {
                 'id': task.id,
                 'name': task.name,
                 'description': task.description,
                 'people_needed': task.people_needed,
                 'time_slot': task.time_slot
-            })
-        
-        total_added = len(created_tasks) + len(restored_tasks_data)
-        all_tasks = created_tasks + restored_tasks_data
+            }
+            for task in created_tasks + restored_tasks
+        ]
+        total_added = len(all_tasks)
         
         return JsonResponse({
             'success': True,
-            'message': f'Úspešne pridaných {len(created_tasks)} nových úloh a obnovených {len(restored_tasks_data)} vymazaných úloh',
+            'message': f'Úspešne pridaných {len(created_tasks)} nových úloh a obnovených {len(restored_tasks)} vymazaných úloh',
             'tasks': all_tasks,
             'total_added': total_added,
             'skipped': len(parsed_tasks) - total_added
@@ -370,6 +364,96 @@ def import_tasks(request):
     except Exception as e:
         return JsonResponse({'error': str(e)}, status=500)
 
+def tokenize_task_line(line):
+    """Rozloží riadok importu úloh na name, people_needed, description a time_slot (ValueError pri chybe)"""
+    # Počet ľudí (X), popis aj časový slot sú voliteľné. Úseky oddeľuje pomlčka
+    # s medzerami okolo alebo hneď za zátvorkou, takže "Check-in" ostane celé.
+    segments = []  # (začiatok, koniec, posledná zátvorka úseku)
+    segment_start = 0
+    depth = 0
+    group_start = None
+    last_group = None  # Pozície poslednej zátvorky najvyššej úrovne v úseku
+    
+    for index, char in enumerate(line):
+        if char == '(':
+            if depth == 0:
+                group_start = index
+            depth += 1
+        elif char == ')':
+            if depth == 0:
+                raise ValueError('Zátvorka bez otvárajúcej zátvorky')
+            depth -= 1
+            if depth == 0:
+                last_group = (group_start, index)
+        elif (
+            char == '-' and depth == 0
+            and (
+                line[index - 1:index] == ')'
+                or (line[index - 1:index].isspace() and (index + 1 == len(line) or line[index + 1].isspace()))
+            )
+        ):
+            segments.append((segment_start, index, last_group))
+            segment_start = index + 1
+            last_group = None
+    
+    if depth:
+        raise ValueError('Neuzavretá zátvorka')
+    segments.append((segment_start, len(line), last_group))
+    
+    def trailing_group(segment):
+        """Zátvorka na konci úseku, inak None"""
+        start, end, group = segment
+        if group and not line[group[1] + 1:end].strip():
+            return group
+        return None
+    
+    # Počet ľudí je posledná číselná zátvorka na konci úseku, úseky pred ňou
+    # patria do názvu ("Umývanie - riad (2) - popis"). Nečíselná zátvorka
+    # na konci prvého úseku je chyba, v ďalších úsekoch je súčasťou textu.
+    people_index = None
+    for index in range(len(segments) - 1, -1, -1):
+        group = trailing_group(segments[index])
+        if group and line[group[0] + 1:group[1]].strip().isdigit():
+            people_index = index
+            break
+    if people_index is None and trailing_group(segments[0]):
+        people_index = 0
+    
+    people_needed = 1
+    if people_index is None:
+        name = line[:segments[0][1]].strip()
+        tail = segments[1:]
+    else:
+        group = trailing_group(segments[people_index])
+        people_text = line[group[0] + 1:group[1]].strip()
+        if not people_text.isdigit() or int(people_text) < 1:
+            raise ValueError(f'Počet ľudí v zátvorke musí byť kladné celé číslo, nie "{people_text}"')
+        people_needed = int(people_text)
+        name = line[:group[0]].strip()
+        tail = segments[people_index + 1:]
+    tail = [line[start:end].strip() for start, end, group in tail]
+    
+    if not name:
+        raise ValueError('Chýba názov úlohy')
+    
+    max_length = Task._meta.get_field('name').max_length
+    if len(name) > max_length:
+        raise ValueError(f'Názov úlohy môže mať najviac {max_length} znakov')
+    
+    # Posledný číselný úsek je časový slot, ostatné úseky tvoria popis
+    time_slot = 1
+    if tail and tail[-1].isdigit():
+        time_slot = int(tail.pop())
+        if time_slot < 1 or time_slot > 5:
+            raise ValueError('Časový slot musí byť medzi 1 a 5')
+    
+    return {
+        'name': name,
+        'people_needed': people_needed,
+        'description': ' - '.join(segment for segment in tail if segment),
+        'time_slot': time_slot
+    }
+
 @csrf_exempt
 @require_http_methods(["PUT"])
 def update_task(request):
@@ -407,6 +491,7 @@ def update_task(request):
         task.people_needed = new_people_needed
         task.time_slot = new_time_slot
         task.save()
+        team_changed(team)
         
         return JsonResponse({
             'success': True,
@@ -446,6 +531,7 @@ def delete_task(request):
         task_name = task.name
         task.is_deleted = True
         task.save()
+        team_changed(team)
         
         return JsonResponse({
             'success': True,
@@ -479,6 +565,7 @@ def restore_task(request):
         task_name = task.name
         task.is_deleted = False
         task.save()
+        team_changed(team)
         
         return JsonResponse({
             'success': True,
@@ -528,6 +615,7 @@ def add_task(request):
                 existing_task.time_slot = time_slot
                 existing_task.is_deleted = False
                 existing_task.save()
+                team_changed(team)
                 
                 return JsonResponse({
                     'success': True, 
@@ -552,6 +640,7 @@ def add_task(request):
             people_needed=people_needed,
             time_slot=time_slot
         )
+        team_changed(team)
         
         return JsonResponse({
             'success': True, 
@@ -570,16 +659,39 @@ def add_task(request):
 @csrf_exempt
 @require_http_methods(["POST"])
 def generate_schedule(request):
-    """Vygeneruje rozvrh úloh na jeden deň"""
+    """Vygeneruje rozvrh úloh na jeden deň alebo na rozsah dní (date_from - date_to)"""
     try:
         data = json.loads(request.body)
         team_id = data.get('team_id')
         admin_password = data.get('admin_password')
         target_date = data.get('date')  # Dátum pre ktorý sa generuje rozvrh
+        date_from = data.get('date_from')  # Alebo rozsah dní
+        date_to = data.get('date_to')
+        engine_mode = data.get('mode') or settings.SCHEDULER_ENGINE_MODE  # 'greedy' alebo 'slot'
+        seed = data.get('seed', 0)  # Iný seed dá iný, ale opakovateľný rozvrh
         
-        if not all([team_id, admin_password, target_date]):
+        if not all([team_id, admin_password]) or not (target_date or (date_from and date_to)):
             return JsonResponse({'error': 'Tím ID, admin heslo a dátum sú povinné'}, status=400)
         
+        if engine_mode not in ('greedy', 'slot'):
+            return JsonResponse({'error': 'Neznámy režim generovania'}, status=400)
+        
+        if not isinstance(seed, int):
+            return JsonResponse({'error': 'Seed musí byť celé číslo'}, status=400)
+        
+        # Parse dátumy
+        if target_date:
+            date_from = date_to = datetime.strptime(target_date, '%Y-%m-%d').date()
+        else:
+            date_from = datetime.strptime(date_from, '%Y-%m-%d').date()
+            date_to = datetime.strptime(date_to, '%Y-%m-%d').date()
+        
+        if date_to < date_from:
+            return JsonResponse({'error': 'Dátum od musí byť pred dátumom do'}, status=400)
+        
+        if (date_to - date_from).days >= MAX_SCHEDULE_RANGE_DAYS:
+            return JsonResponse({'error': f'Rozsah môže mať najviac {MAX_SCHEDULE_RANGE_DAYS} dní'}, status=400)
+        
         team = get_object_or_404(Team, id=team_id)
         
         if team.admin_password != admin_password:
@@ -592,492 +704,278 @@ def generate_schedule(request):
         if not members or not tasks:
             return JsonResponse({'error': 'Tím musí mať aspoň jedného člena a jednu úlohu'}, status=400)
         
-        # Parse dátum
-        target_date = datetime.strptime(target_date, '%Y-%m-%d').date()
+        if data.get('async'):
+            # Generovanie prebehne vo workeri, klient sa na výsledok pýta podľa ID úlohy
+            job = ScheduleJob.objects.create(team=team, date_from=date_from, date_to=date_to, mode=engine_mode, seed=seed)
+            return JsonResponse({'success': True, 'job_id': job.id, 'status': job.status}, status=202)
         
-        # Vymaž existujúce rozvrhy pre tento dátum a tím
-        TaskSchedule.objects.filter(team=team, date=target_date).delete()
+        if data.get('dry_run'):
+            # Len návrh - nič sa nezapíše, potvrdí sa cez /api/commit-schedule/ s proposal_id
+            proposal_id, schedules, message = propose_team_schedules(team, members, tasks, date_from, date_to, engine_mode, seed)
+            return JsonResponse({
+                'success': True,
+                'dry_run': True,
+                'proposal_id': proposal_id,
+                'schedules': schedules,
+                'message': message
+            })
         
-        # Funkcia na kontrolu či sa vyčerpali všetky unikátne kombinácie
-        def should_reset_counters():
-            # Ak je počet členov menší ako maximálny počet potrebných ľudí pre úlohu, nemôže sa vyčerpať
-            max_people_needed = max(task.people_needed for task in tasks)
-            if len(members) < max_people_needed:
-                return False
-            
-            # Skontroluj či existujú úlohy ktoré sa nedajú priradiť bez opakovania
-            for task in tasks:
-                if task.people_needed == 1:
-                    # Pre jednu osobu - ak všetci už robili túto úlohu
-                    all_have_done = True
-                    for member in members:
-                        if not TaskSchedule.objects.filter(
-                            team=team,
-                            task=task,
-                            members=member,
-                            date__lt=target_date
-                        ).exists():
-                            all_have_done = False
-                            break
-                    if not all_have_done:
-                        return False
-                else:
-                    # Pre viac ľudí - skontroluj či existuje aspoň jedna kombinácia bez opakovania
-                    combinations = list(itertools.combinations(members, task.people_needed))
-                    has_unused_combination = False
-                    for combination in combinations:
-                        member_ids = [m.id for m in combination]
-                        # Hľadaj rozvrhy kde sú VŠETCI členovia tejto skupiny priradení k tejto úlohe
-                        schedules_with_all_members = TaskSchedule.objects.filter(
-                            team=team,
-                            task=task,
-                            date__lt=target_date
-                        )
-                        
-                        combination_used = False
-                        for schedule in schedules_with_all_members:
-                            schedule_member_ids = set(schedule.members.values_list('id', flat=True))
-                            if set(member_ids).issubset(schedule_member_ids):
-                                combination_used = True
-                                break
-                        
-                        if not combination_used:
-                            has_unused_combination = True
-                            break
-                    
-                    if has_unused_combination:
-                        return False
-            
-            return True
-        
-        # Generuj rozvrh pre jeden deň
-        schedules = []
-        member_task_count = {member.id: 0 for member in members}
-        member_pair_count = {}
-        
-        # Zoskup úlohy podľa časových slotov
-        tasks_by_time_slot = {}
-        for task in tasks:
-            time_slot = task.time_slot
-            if time_slot not in tasks_by_time_slot:
-                tasks_by_time_slot[time_slot] = []
-            tasks_by_time_slot[time_slot].append(task)
-        
-        # Rotuj poradie úloh a členov pre lepšiu distribúciu
-        # Použi kombináciu dátumu a času pre lepšiu rotáciu
-        seed_value = hash(target_date) % 1000000
-        if should_reset_counters():
-            # Ak sa vyčerpali kombinácie, použij iný seed pre leitmotiv
-            seed_value = (seed_value + 1) % 1000000
-        
-        random.seed(seed_value)
-        rotated_members = list(members)
-        random.shuffle(rotated_members)
-        
-        # Získaj históriu pred aktuálnym dátumom pre lepšie počítadlá
-        historical_schedules = TaskSchedule.objects.filter(
-            team=team,
-            date__lt=target_date
-        ).select_related('task').prefetch_related('members')
+        schedules, message = generate_team_schedules(team, members, tasks, date_from, date_to, engine_mode, seed)
         
-        # Inicializuj počítadlá z histórie
-        for schedule in historical_schedules:
-            for member in schedule.members.all():
-                member_task_count[member.id] += 1
-            
-            # Aktualizuj počítadlá párov z histórie
-            members_list = list(schedule.members.all())
-            if len(members_list) > 1:
-                for i in range(len(members_list)):
-                    for j in range(i+1, len(members_list)):
-                        pair_key = tuple(sorted([members_list[i].id, members_list[j].id]))
-                        member_pair_count[pair_key] = member_pair_count.get(pair_key, 0) + 1
-        
-        # Ak sa vyčerpali všetky unikátne kombinácie, resetuj počítadlá
-        if should_reset_counters():
-            member_task_count = {member.id: 0 for member in members}
-            member_pair_count = {}
-            print(f"Počítadlá pre tím {team.name} boli resetované - vyčerpali sa všetky unikátne kombinácie.")
-        
-        # Spracuj úlohy podľa časových slotov
-        for time_slot in sorted(tasks_by_time_slot.keys()):
-            tasks_in_slot = tasks_by_time_slot[time_slot]
-            random.shuffle(tasks_in_slot)  # Náhodne poradie úloh v rámci slotu
-            
-            for task in tasks_in_slot:
-                # Nájdi najlepšiu kombináciu členov pre úlohu
-                best_members = find_best_member_combination(
-                    rotated_members, task, member_task_count, member_pair_count, target_date, time_slot
-                )
-                
-                if best_members:
-                    # Vytvor rozvrh
-                    schedule = TaskSchedule.objects.create(
-                        team=team,
-                        date=target_date,
-                        task=task
-                    )
-                    
-                    # Pridaj členov do rozvrhu
-                    schedule.members.set(best_members)
-                    
-                    schedules.append({
-                        'id': schedule.id,
-                        'date': target_date.isoformat(),
-                        'task': task.name,
-                        'people_needed': task.people_needed,
-                        'time_slot': task.time_slot,
-                        'members': [member.name for member in best_members]
-                    })
-                    
-                    # Aktualizuj počítadlá
-                    for member in best_members:
-                        member_task_count[member.id] += 1
-                    
-                    # Aktualizuj počítadlá párov
-                    if len(best_members) > 1:
-                        for i in range(len(best_members)):
-                            for j in range(i+1, len(best_members)):
-                                pair_key = tuple(sorted([best_members[i].id, best_members[j].id]))
-                                member_pair_count[pair_key] = member_pair_count.get(pair_key, 0) + 1
-        
-        # Kontrola či sa vyčerpali všetky unikátne kombinácie počas generovania
-        # Ak áno, resetuj počítadlá pre budúce generovania
-        if should_reset_counters():
-            # Resetuj počítadlá v databáze alebo cache pre budúce generovania
-            # Toto by sa mohlo implementovať ako globálny cache alebo databázová tabuľka
-            # Pre teraz len logujeme informáciu
-            print(f"Všetky unikátne kombinácie pre tím {team.name} sa vyčerpali. Počítadlá boli resetované.")
+        return JsonResponse({
+            'success': True,
+            'schedules': schedules,
+            'message': message
+        })
+        
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=500)
+
+@csrf_exempt
+@require_http_methods(["POST"])
+def commit_schedule(request):
+    """Uloží návrh rozvrhu vypočítaný cez dry_run bez nového generovania"""
+    try:
+        data = json.loads(request.body)
+        team_id = data.get('team_id')
+        admin_password = data.get('admin_password')
+        proposal_id = data.get('proposal_id')
+        
+        if not all([team_id, admin_password, proposal_id]):
+            return JsonResponse({'error': 'Tím ID, admin heslo a ID návrhu sú povinné'}, status=400)
+        
+        team = get_object_or_404(Team, id=team_id)
+        
+        if team.admin_password != admin_password:
+            return JsonResponse({'error': 'Nesprávne admin heslo'}, status=401)
+        
+        members = list(team.members.all())
+        tasks = list(team.tasks.filter(is_deleted=False))
+        
+        try:
+            schedules, message = commit_team_schedules(team, members, tasks, proposal_id)
+        except ProposalExpired:
+            return JsonResponse({'error': 'Návrh rozvrhu vypršal alebo sa zmenili údaje tímu, vygenerujte ho znova'}, status=409)
         
         return JsonResponse({
             'success': True,
             'schedules': schedules,
-            'message': f'Vygenerovaný rozvrh pre {target_date.strftime("%d.%m.%Y")}'
+            'message': message
         })
         
     except Exception as e:
         return JsonResponse({'error': str(e)}, status=500)
 
-def find_best_member_combination(members, task, member_task_count, member_pair_count, date, current_time_slot=None):
-    """Nájde najlepšiu kombináciu členov pre úlohu s úplnou kontrolou párov a úloh"""
-    people_needed = task.people_needed
-    
-    # Získaj tím z prvej úlohy
-    team = task.team
-    
-    # Funkcia na kontrolu spravodlivosti - prioritizuje spravodlivosť
-    def is_fair_distribution(candidate_members, current_task_counts):
-        if not candidate_members:
-            return False
-        
-        # Vypočítaj nové počty úloh po pridaní tejto úlohy
-        new_task_counts = current_task_counts.copy()
-        for member in candidate_members:
-            new_task_counts[member.id] = new_task_counts.get(member.id, 0) + 1
-        
-        # Nájdi minimálny a maximálny počet úloh
-        min_tasks = min(new_task_counts.values())
-        max_tasks = max(new_task_counts.values())
-        
-        # Ak je rozdiel väčší ako 2, nie je to spravodlivé
-        if max_tasks - min_tasks > 2:
-            return False
-        
-        # Ak niekto má 3+ úlohy, skontroluj či všetci ostatní majú aspoň 1
-        if max_tasks >= 3:
-            members_with_less_than_1 = sum(1 for count in new_task_counts.values() if count < 1)
-            if members_with_less_than_1 > 0:
-                return False
-        
-        return True
-    
-    # Funkcia na výpočet skóre spravodlivosti - nižšie skóre = lepšia spravodlivosť
-    def calculate_fairness_score(candidate_members, current_task_counts):
-        if not candidate_members:
-            return float('inf')
+@csrf_exempt
+@require_http_methods(["POST"])
+def repair_schedule(request):
+    """Opraví rozvrh dňa po zmene členov alebo úloh, ostatné priradenia dňa zostanú"""
+    try:
+        data = json.loads(request.body)
+        team_id = data.get('team_id')
+        admin_password = data.get('admin_password')
+        target_date = data.get('date')
+        member_ids = data.get('member_ids', [])  # Členovia, ktorí v daný deň nemôžu mať úlohu
+        task_ids = data.get('task_ids', [])  # Zmenené úlohy
+        engine_mode = data.get('mode') or settings.SCHEDULER_ENGINE_MODE
         
-        # Vypočítaj nové počty úloh po pridaní tejto úlohy
-        new_task_counts = current_task_counts.copy()
-        for member in candidate_members:
-            new_task_counts[member.id] = new_task_counts.get(member.id, 0) + 1
+        if not all([team_id, admin_password, target_date]):
+            return JsonResponse({'error': 'Tím ID, admin heslo a dátum sú povinné'}, status=400)
         
-        # Nájdi minimálny a maximálny počet úloh
-        min_tasks = min(new_task_counts.values())
-        max_tasks = max(new_task_counts.values())
+        if engine_mode not in ('greedy', 'slot'):
+            return JsonResponse({'error': 'Neznámy režim generovania'}, status=400)
         
-        # Skóre spravodlivosti - čím menšie, tým lepšie
-        fairness_score = max_tasks - min_tasks
+        if not isinstance(member_ids, list) or not isinstance(task_ids, list):
+            return JsonResponse({'error': 'member_ids a task_ids musia byť zoznamy'}, status=400)
         
-        # Penalizuj situácie kde niekto má 3+ úlohy a niekto 0
-        if max_tasks >= 3:
-            members_with_less_than_1 = sum(1 for count in new_task_counts.values() if count < 1)
-            fairness_score += members_with_less_than_1 * 10
+        target_date = datetime.strptime(target_date, '%Y-%m-%d').date()
         
-        return fairness_score
-    
-    # Ak je zadaný časový slot, skontroluj či členovia už nemajú úlohy v tomto čase
-    if current_time_slot is not None:
-        # Filtruj členov ktorí už nemajú úlohy v aktuálnom časovom slote
-        available_members = []
-        for member in members:
-            # Skontroluj či člen už nemá úlohu v aktuálnom časovom slote
-            has_task_in_slot = TaskSchedule.objects.filter(
-                team=team,
-                date=date,
-                task__time_slot=current_time_slot,
-                members=member
-            ).exists()
-            
-            if not has_task_in_slot:
-                available_members.append(member)
+        team = get_object_or_404(Team, id=team_id)
         
-        # Ak nie sú dostupní žiadni členovia pre tento časový slot, vráť None
-        if len(available_members) < people_needed:
-            return None
+        if team.admin_password != admin_password:
+            return JsonResponse({'error': 'Nesprávne admin heslo'}, status=401)
         
-        # Použi len dostupných členov
-        members = available_members
-    
-    # Kontrola histórie iba pred aktuálnym dátumom
-    def has_done_task_before_date(member, task, team, date):
-        return TaskSchedule.objects.filter(
-            team=team,
-            task=task,
-            members=member,
-            date__lt=date
-        ).exists()
-    
-    def has_done_task_as_group_before_date(members_list, task, team, date):
-        if len(members_list) == 1:
-            return has_done_task_before_date(members_list[0], task, team, date)
-        
-        # Pre viac členov kontroluj či už existovala kombinácia tejto skupiny s touto úlohou
-        member_ids = [m.id for m in members_list]
-        # Hľadaj rozvrhy kde sú VŠETCI členovia tejto skupiny priradení k tejto úlohe
-        schedules_with_all_members = TaskSchedule.objects.filter(
-            team=team,
-            task=task,
-            date__lt=date
-        )
+        members = list(team.members.all())
+        tasks = list(team.tasks.filter(is_deleted=False))
         
-        for schedule in schedules_with_all_members:
-            schedule_member_ids = set(schedule.members.values_list('id', flat=True))
-            if set(member_ids).issubset(schedule_member_ids):
-                return True
+        schedules, removed_count, kept_count = repair_team_schedule(
+            team, members, tasks, target_date, member_ids, task_ids, engine_mode
+        )
         
-        return False
-    
-    if people_needed == 1:
-        # Pre jednu osobu - vyber člena ktorý túto úlohu ešte nerobil
-        members_without_task = []
-        for member in members:
-            if not has_done_task_before_date(member, task, team, date):
-                members_without_task.append(member)
-        
-        if members_without_task:
-            # Najprv skús nájsť člena s najmenším počtom úloh ktorý spravodlivo rozdelí úlohy
-            # Zoraď členov podľa skóre spravodlivosti (od najmenšieho)
-            members_with_scores = []
-            for member in members_without_task:
-                fairness_score = calculate_fairness_score([member], member_task_count)
-                members_with_scores.append((fairness_score, member_task_count[member.id], member))
-            
-            # Zoraď podľa skóre spravodlivosti, potom podľa počtu úloh
-            members_with_scores.sort(key=lambda x: (x[0], x[1]))
-            
-            # Ak je prvá kombinácia spravodlivá, použij ju
-            if is_fair_distribution([members_with_scores[0][2]], member_task_count):
-                return [members_with_scores[0][2]]
-            
-            # Inak vyber člena s najmenším počtom úloh
-            min_task_count = min(member_task_count[m.id] for m in members_without_task)
-            candidates = [m for m in members_without_task if member_task_count[m.id] == min_task_count]
-            random.shuffle(candidates)
-            return [candidates[0]]
-        else:
-            # Ak všetci už túto úlohu robili, skús nájsť spravodlivú kombináciu
-            members_with_scores = []
-            for member in members:
-                fairness_score = calculate_fairness_score([member], member_task_count)
-                members_with_scores.append((fairness_score, member_task_count[member.id], member))
-            
-            # Zoraď podľa skóre spravodlivosti, potom podľa počtu úloh
-            members_with_scores.sort(key=lambda x: (x[0], x[1]))
-            
-            # Ak je prvá kombinácia spravodlivá, použij ju
-            if is_fair_distribution([members_with_scores[0][2]], member_task_count):
-                return [members_with_scores[0][2]]
-            
-            # Inak vyber člena s najmenším počtom úloh
-            min_task_count = min(member_task_count[m.id] for m in members)
-            candidates = [m for m in members if member_task_count[m.id] == min_task_count]
-            random.shuffle(candidates)
-            return [candidates[0]]
-    
-    elif people_needed == 2:
-        # Pre dve osoby - kontroluj kombináciu dvojica+úloha
-        best_score = float('inf')
-        best_combination = None
-        
-        # Generuj všetky možné dvojice
-        all_combinations = []
-        for i, member1 in enumerate(members):
-            for j, member2 in enumerate(members[i+1:], i+1):
-                # Skontroluj či niektorý z členov už túto úlohu robil
-                if has_done_task_before_date(member1, task, team, date) or has_done_task_before_date(member2, task, team, date):
-                    continue
-                
-                # Skontroluj či táto kombinácia dvojica+úloha už existovala
-                if has_done_task_as_group_before_date([member1, member2], task, team, date):
-                    continue
-                
-                # Skontroluj počet spoločných úloh tejto dvojice
-                pair_key = tuple(sorted([member1.id, member2.id]))
-                pair_count = member_pair_count.get(pair_key, 0)
-                
-                # Skóre = súčet úloh oboch členov + počet spoločných úloh (vyššia váha)
-                score = member_task_count[member1.id] + member_task_count[member2.id] + pair_count * 10
-                all_combinations.append((score, [member1, member2]))
-        
-        # Zoraď podľa skóre spravodlivosti, potom podľa skóre úloh
-        all_combinations_with_fairness = []
-        for score, combination in all_combinations:
-            fairness_score = calculate_fairness_score(combination, member_task_count)
-            all_combinations_with_fairness.append((fairness_score, score, combination))
-        
-        # Zoraď podľa skóre spravodlivosti (primárne), potom podľa skóre úloh (sekundárne)
-        all_combinations_with_fairness.sort(key=lambda x: (x[0], x[1]))
-        all_combinations = [(score, combination) for fairness_score, score, combination in all_combinations_with_fairness]
-        
-        # Najprv skús nájsť spravodlivú kombináciu bez opakovania
-        for score, combination in all_combinations:
-            if is_fair_distribution(combination, member_task_count):
-                return combination
-        
-        # Ak sa nenašla žiadna spravodlivá kombinácia bez opakovania, 
-        # vyber kombináciu s najlepším skóre spravodlivosti
-        best_fairness_score = float('inf')
-        best_combination = None
-        
-        for score, combination in all_combinations:
-            fairness_score = calculate_fairness_score(combination, member_task_count)
-            if fairness_score < best_fairness_score:
-                best_fairness_score = fairness_score
-                best_combination = combination
-        
-        if best_combination:
-            return best_combination
-        
-        # Ak sa stále nenašla žiadna kombinácia, vyber dvojicu s najmenším počtom úloh
-        min_task_count = min(member_task_count[m.id] for m in members)
-        candidates = [m for m in members if member_task_count[m.id] == min_task_count]
-        random.shuffle(candidates)
-        return candidates[:2]
-    
-    else:
-        # Pre viac ako 2 osoby - implementuj rotáciu s minimálnym opakovaním
-        all_combinations = []
+        return JsonResponse({
+            'success': True,
+            'schedules': schedules,
+            'removed': removed_count,
+            'kept': kept_count,
+            'message': f'Opravený rozvrh pre {target_date.strftime("%d.%m.%Y")}: {len(schedules)} nových, {kept_count} zachovaných priradení'
+        })
         
-        # Generuj všetky možné kombinácie členov
-        for combination in itertools.combinations(members, people_needed):
-            # Skontroluj či niektorý z členov už túto úlohu robil
-            if any(has_done_task_before_date(m, task, team, date) for m in combination):
-                continue
-            
-            # Skontroluj či táto kombinácia skupina+úloha už existovala
-            if has_done_task_as_group_before_date(combination, task, team, date):
-                continue
-            
-            # Skontroluj počet spoločných úloh medzi členmi skupiny
-            group_score = 0
-            for i in range(len(combination)):
-                for j in range(i+1, len(combination)):
-                    pair_key = tuple(sorted([combination[i].id, combination[j].id]))
-                    group_score += member_pair_count.get(pair_key, 0)
-            
-            # Skóre = súčet úloh všetkých členov + počet spoločných úloh (vyššia váha)
-            total_task_count = sum(member_task_count[m.id] for m in combination)
-            score = total_task_count + group_score * 10
-            all_combinations.append((score, list(combination)))
-        
-        # Zoraď podľa skóre spravodlivosti, potom podľa skóre úloh
-        all_combinations_with_fairness = []
-        for score, combination in all_combinations:
-            fairness_score = calculate_fairness_score(combination, member_task_count)
-            all_combinations_with_fairness.append((fairness_score, score, combination))
-        
-        # Zoraď podľa skóre spravodlivosti (primárne), potom podľa skóre úloh (sekundárne)
-        all_combinations_with_fairness.sort(key=lambda x: (x[0], x[1]))
-        all_combinations = [(score, combination) for fairness_score, score, combination in all_combinations_with_fairness]
-        
-        # Najprv skús nájsť spravodlivú kombináciu bez opakovania
-        for score, combination in all_combinations:
-            if is_fair_distribution(combination, member_task_count):
-                return combination
-        
-        # Ak sa nenašla žiadna spravodlivá kombinácia bez opakovania, 
-        # vyber kombináciu s najlepším skóre spravodlivosti
-        best_fairness_score = float('inf')
-        best_combination = None
-        
-        for score, combination in all_combinations:
-            fairness_score = calculate_fairness_score(combination, member_task_count)
-            if fairness_score < best_fairness_score:
-                best_fairness_score = fairness_score
-                best_combination = combination
-        
-        if best_combination:
-            return best_combination
-        
-        # Ak sa stále nenašla žiadna kombinácia, vyber skupinu s najmenším počtom úloh
-        min_task_count = min(member_task_count[m.id] for m in members)
-        candidates = [m for m in members if member_task_count[m.id] == min_task_count]
-        random.shuffle(candidates)
-        return candidates[:people_needed]
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=500)
 
 @csrf_exempt
 @require_http_methods(["POST"])
+def get_schedule_job(request):
+    """Vráti stav a výsledok generovania rozvrhu spusteného na pozadí"""
+    try:
+        data = json.loads(request.body)
+        job_id = data.get('job_id')
+        admin_password = data.get('admin_password')
+        
+        if not all([job_id, admin_password]):
+            return JsonResponse({'error': 'ID generovania a admin heslo sú povinné'}, status=400)
+        
+        # Generovanie, ktorého worker zlyhal, sa nesmie tváriť, že stále beží
+        fail_stale_jobs()
+        job = get_object_or_404(ScheduleJob.objects.select_related('team'), id=job_id)
+        
+        if job.team.admin_password != admin_password:
+            return JsonResponse({'error': 'Nesprávne admin heslo'}, status=401)
+        
+        response = {
+            'success': True,
+            'job_id': job.id,
+            'status': job.status
+        }
+        if job.status == ScheduleJob.STATUS_DONE:
+            response.update(job.result)
+        elif job.status == ScheduleJob.STATUS_FAILED:
+            response['error'] = job.error
+        
+        return JsonResponse(response)
+        
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=500)
+
+def read_request_data(request):
+    """Parametre čítania - pri GET z query stringu, inak z JSON tela"""
+    if request.method in ('GET', 'HEAD'):
+        return request.GET.dict()
+    return json.loads(request.body)
+
+def team_etag(team_id, version):
+    """ETag odpovede odvodený od verzie tímu - mení sa pri každom zápise do tímu"""
+    return f'W/"team-{team_id}-v{version}"'
+
+def team_password_etag(request, *args, **kwargs):
+    """ETag pre čítania podľa hesla tímu, len pre GET (POST sa nekešuje)"""
+    if request.method not in ('GET', 'HEAD'):
+        return None
+    team = Team.objects.filter(team_password=request.GET.get('team_password')).values_list('id', 'version').first()
+    return team_etag(*team) if team else None
+
+def team_info_etag(request, team_id):
+    """ETag pre informácie o tíme"""
+    version = Team.objects.filter(id=team_id).values_list('version', flat=True).first()
+    return team_etag(team_id, version) if version is not None else None
+
+@csrf_exempt
+@cache_control(no_cache=True, private=True)  # Dáta podľa hesla tímu neukladajú zdieľané proxy
+@require_http_methods(["GET", "POST"])
+@condition(etag_func=team_password_etag)
 def get_team_schedule(request):
     """Získa rozvrh tímu pomocou týmového hesla"""
     try:
-        data = json.loads(request.body)
+        data = read_request_data(request)
         team_password = data.get('team_password')
+        # Voliteľný rozsah dní a stránkovanie: cursor je next_cursor z predchádzajúcej stránky
+        date_from = data.get('date_from')
+        date_to = data.get('date_to')
+        limit = data.get('limit')
+        cursor = data.get('cursor')
+        
+        if isinstance(limit, str) and limit.isdigit():
+            limit = int(limit)  # Z query stringu prichádza text
         
         if not team_password:
             return JsonResponse({'error': 'Heslo tímu je povinné'}, status=400)
         
-        team = get_object_or_404(Team, team_password=team_password)
+        # Stránkuje sa len na požiadanie, pokračovanie kurzorom má predvolenú veľkosť stránky
+        if limit is None and cursor:
+            limit = SCHEDULE_PAGE_SIZE
         
-        # Získaj rozvrhy zoradené podľa dátumu a časových slotov
-        schedules = TaskSchedule.objects.filter(team=team).order_by('date', 'task__time_slot')
-        
-        schedule_data = []
-        for schedule in schedules:
-            schedule_data.append({
-                'id': schedule.id,
-                'date': schedule.date.isoformat(),
-                'task': schedule.task.name,
-                'people_needed': schedule.task.people_needed,
-                'time_slot': schedule.task.time_slot,
-                'members': [member.name for member in schedule.members.all()]
-            })
+        if limit is not None and (not isinstance(limit, int) or not 1 <= limit <= MAX_SCHEDULE_PAGE_SIZE):
+            return JsonResponse({'error': f'Limit musí byť celé číslo od 1 do {MAX_SCHEDULE_PAGE_SIZE}'}, status=400)
         
-        return JsonResponse({
-            'success': True,
-            'team_name': team.name,
-            'team_id': team.id,
-            'schedules': schedule_data
-        })
+        team = get_object_or_404(Team, team_password=team_password)
+        
+        if date_from:
+            date_from = datetime.strptime(date_from, '%Y-%m-%d').date()
+        if date_to:
+            date_to = datetime.strptime(date_to, '%Y-%m-%d').date()
+        
+        cursor_position = None
+        if cursor:
+            try:
+                cursor_position = decode_schedule_cursor(cursor)
+            except (ValueError, TypeError):
+                return JsonResponse({'error': 'Neplatný kurzor'}, status=400)
+        
+        params = {'date_from': str(date_from or ''), 'date_to': str(date_to or ''), 'limit': limit, 'cursor': cursor or ''}
+        body = cached_response_body(
+            team, 'schedule', params,
+            lambda: team_schedule_payload(team, date_from, date_to, limit, cursor_position)
+        )
+        return HttpResponse(body, content_type='application/json')
         
     except Exception as e:
         return JsonResponse({'error': str(e)}, status=500)
 
+def team_schedule_payload(team, date_from, date_to, limit, cursor_position):
+    """Odpoveď get_team_schedule - jedna stránka rozvrhov tímu (limit None = všetky)"""
+    # Získaj rozvrhy zoradené podľa dátumu a časových slotov, ID určuje poradie v rámci slotu
+    schedules = schedule_queryset(team).order_by('date', 'task__time_slot', 'id')
+    
+    if date_from:
+        schedules = schedules.filter(date__gte=date_from)
+    if date_to:
+        schedules = schedules.filter(date__lte=date_to)
+    
+    if cursor_position:
+        # Pokračuj za posledným rozvrhom predchádzajúcej stránky
+        cursor_date, cursor_slot, cursor_id = cursor_position
+        schedules = schedules.filter(
+            Q(date__gt=cursor_date)
+            | Q(date=cursor_date, task__time_slot__gt=cursor_slot)
+            | Q(date=cursor_date, task__time_slot=cursor_slot, id__gt=cursor_id)
+        )
+    
+    if limit is None:
+        page = list(schedules)
+        next_cursor = None
+    else:
+        # O jeden riadok viac prezradí, či existuje ďalšia stránka
+        page = list(schedules[:limit + 1])
+        next_cursor = encode_schedule_cursor(page[limit - 1]) if len(page) > limit else None
+        page = page[:limit]
+    
+    schedule_data = []
+    for schedule in page:
+        schedule_data.append({
+            'id': schedule.id,
+            'date': schedule.date.isoformat(),
+            'task': schedule.task.name,
+            'people_needed': schedule.task.people_needed,
+            'time_slot': schedule.task.time_slot,
+            'members': [member.name for member in schedule.members.all()]
+        })
+    
+    return {
+        'success': True,
+        'team_name': team.name,
+        'team_id': team.id,
+        'schedules': schedule_data,
+        'next_cursor': next_cursor
+    }
+
 @csrf_exempt
-@require_http_methods(["POST"])
+@cache_control(no_cache=True, private=True)
+@require_http_methods(["GET", "POST"])
+@condition(etag_func=team_password_etag)
 def get_team_schedule_for_date(request):
-    """Získa rozvrh tímu pre konkrétny deň"""
+    """Získa rozvrh tímu pre konkrétny deň (GET vracia ETag a pri zhode 304)"""
     try:
-        data = json.loads(request.body)
+        data = read_request_data(request)
         team_password = data.get('team_password')
         target_date = data.get('date')
         
@@ -1089,48 +987,106 @@ def get_team_schedule_for_date(request):
         # Parse dátum
         target_date = datetime.strptime(target_date, '%Y-%m-%d').date()
         
-        # Získaj rozvrhy pre konkrétny deň zoradené podľa časových slotov
-        schedules = TaskSchedule.objects.filter(team=team, date=target_date).order_by('task__time_slot')
+        body = cached_response_body(
+            team, 'schedule-for-date', {'date': target_date.isoformat()},
+            lambda: schedule_for_date_payload(team, target_date)
+        )
+        return HttpResponse(body, content_type='application/json')
         
-        if not schedules.exists():
-            return JsonResponse({
-                'success': True,
-                'team_name': team.name,
-                'team_id': team.id,
-                'date': target_date.isoformat(),
-                'schedules': [],
-                'message': f'Pre {target_date.strftime("%d.%m.%Y")} nie je vygenerovaný rozvrh'
-            })
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=500)
+
+def schedule_for_date_payload(team, target_date):
+    """Odpoveď get_team_schedule_for_date - rozvrh tímu pre jeden deň"""
+    # Získaj rozvrhy pre konkrétny deň zoradené podľa časových slotov
+    schedules = schedule_queryset(team).filter(date=target_date).order_by('task__time_slot', 'id')
+    
+    schedule_data = []
+    for schedule in schedules:
+        schedule_data.append({
+            'id': schedule.id,
+            'task_id': schedule.task.id,
+            'task': schedule.task.name,
+            'task_description': schedule.task.description,
+            'people_needed': schedule.task.people_needed,
+            'time_slot': schedule.task.time_slot,
+            'members': [member.name for member in schedule.members.all()]
+        })
+    
+    response_data = {
+        'success': True,
+        'team_name': team.name,
+        'team_id': team.id,
+        'date': target_date.isoformat(),
+        'schedules': schedule_data
+    }
+    if not schedule_data:
+        response_data['message'] = f'Pre {target_date.strftime("%d.%m.%Y")} nie je vygenerovaný rozvrh'
+    return response_data
+
+def schedule_queryset(team):
+    """Rozvrhy tímu s úlohou v tom istom dotaze a členmi načítanými jedným ďalším dotazom"""
+    return (
+        TaskSchedule.objects.filter(team=team)
+        .select_related('task')
+        .prefetch_related(Prefetch('members', queryset=TeamMember.objects.only('id', 'name')))
+    )
+
+def encode_schedule_cursor(schedule):
+    """Kurzor ukazujúci za daný rozvrh - (dátum, časový slot, ID) v URL-bezpečnom base64"""
+    value = f'{schedule.date.isoformat()}|{schedule.task.time_slot}|{schedule.id}'
+    return base64.urlsafe_b64encode(value.encode()).decode()
+
+def decode_schedule_cursor(cursor):
+    """Rozloží kurzor na (dátum, časový slot, ID), pri neplatnom kurzore vyhodí ValueError"""
+    value = base64.urlsafe_b64decode(cursor.encode()).decode()
+    cursor_date, cursor_slot, cursor_id = value.split('|')
+    return datetime.strptime(cursor_date, '%Y-%m-%d').date(), int(cursor_slot), int(cursor_id)
+
+@csrf_exempt
+@require_http_methods(["POST"])
+def export_schedule(request):
+    """Exportuje rozvrh tímu ako CSV, iCalendar (ics) alebo NDJSON
+
+    Odpoveď sa streamuje po riadkoch priamo z databázového kurzora,
+    takže prvé bajty odchádzajú hneď a pamäť nezávisí od dĺžky histórie.
+    """
+    try:
+        data = json.loads(request.body)
+        team_password = data.get('team_password')
+        export_format = data.get('format', 'csv')
+        date_from = data.get('date_from')
+        date_to = data.get('date_to')
         
-        schedule_data = []
-        for schedule in schedules:
-            schedule_data.append({
-                'id': schedule.id,
-                'task_id': schedule.task.id,
-                'task': schedule.task.name,
-                'task_description': schedule.task.description,
-                'people_needed': schedule.task.people_needed,
-                'time_slot': schedule.task.time_slot,
-                'members': [member.name for member in schedule.members.all()]
-            })
+        if not team_password:
+            return JsonResponse({'error': 'Heslo tímu je povinné'}, status=400)
         
-        return JsonResponse({
-            'success': True,
-            'team_name': team.name,
-            'team_id': team.id,
-            'date': target_date.isoformat(),
-            'schedules': schedule_data
-        })
+        if export_format not in EXPORT_FORMATS:
+            return JsonResponse({'error': f'Neznámy formát exportu, povolené sú: {", ".join(EXPORT_FORMATS)}'}, status=400)
+        
+        team = get_object_or_404(Team, team_password=team_password)
+        
+        if date_from:
+            date_from = datetime.strptime(date_from, '%Y-%m-%d').date()
+        if date_to:
+            date_to = datetime.strptime(date_to, '%Y-%m-%d').date()
+        
+        content_type, extension = EXPORT_FORMATS[export_format]
+        response = StreamingHttpResponse(stream_export(export_format, team, date_from, date_to), content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="rozvrh-{team.id}.{extension}"'
+        return response
         
     except Exception as e:
         return JsonResponse({'error': str(e)}, status=500)
 
 @csrf_exempt
-@require_http_methods(["POST"])
+@cache_control(no_cache=True, private=True)
+@require_http_methods(["GET", "POST"])
+@condition(etag_func=team_password_etag)
 def get_task_details(request):
-    """Získa detailné informácie o úlohe"""
+    """Získa detailné informácie o úlohe (GET vracia ETag a pri zhode 304)"""
     try:
-        data = json.loads(request.body)
+        data = read_request_data(request)
         task_id = data.get('task_id')
         team_password = data.get('team_password')
         
@@ -1138,42 +1094,71 @@ def get_task_details(request):
             return JsonResponse({'error': 'ID úlohy a heslo tímu sú povinné'}, status=400)
         
         team = get_object_or_404(Team, team_password=team_password)
-        task = get_object_or_404(Task, id=task_id, team=team)
         
-        return JsonResponse({
-            'success': True,
-            'task': {
-                'id': task.id,
-                'name': task.name,
-                'description': task.description,
-                'people_needed': task.people_needed,
-                'time_slot': task.time_slot
+        def build_payload():
+            task = get_object_or_404(Task, id=task_id, team=team)
+            return {
+                'success': True,
+                'task': {
+                    'id': task.id,
+                    'name': task.name,
+                    'description': task.description,
+                    'people_needed': task.people_needed,
+                    'time_slot': task.time_slot
+                }
             }
-        })
+        
+        body = cached_response_body(team, 'task-details', {'task_id': str(task_id)}, build_payload)
+        return HttpResponse(body, content_type='application/json')
         
     except Exception as e:
         return JsonResponse({'error': str(e)}, status=500)
 
 @csrf_exempt
+@cache_control(no_cache=True)
 @require_http_methods(["GET"])
+@condition(etag_func=team_info_etag)
 def get_team_info(request, team_id):
-    """Získa informácie o tíme"""
+    """Získa informácie o tíme (vracia ETag a pri zhode 304)"""
     try:
         team = get_object_or_404(Team, id=team_id)
         
-        members = [{'id': m.id, 'name': m.name} for m in team.members.all()]
-        tasks = [{'id': t.id, 'name': t.name, 'description': t.description, 'people_needed': t.people_needed, 'time_slot': t.time_slot, 'is_deleted': t.is_deleted} for t in team.tasks.all()]
+        def build_payload():
+            members = [{'id': m.id, 'name': m.name} for m in team.members.all()]
+            tasks = [{'id': t.id, 'name': t.name, 'description': t.description, 'people_needed': t.people_needed, 'time_slot': t.time_slot, 'is_deleted': t.is_deleted} for t in team.tasks.all()]
+            return {
+                'success': True,
+                'team': {
+                    'id': team.id,
+                    'name': team.name,
+                    'created_at': team.created_at.isoformat()
+                },
+                'members': members,
+                'tasks': tasks
+            }
         
-        return JsonResponse({
-            'success': True,
-            'team': {
-                'id': team.id,
-                'name': team.name,
-                'created_at': team.created_at.isoformat()
-            },
-            'members': members,
-            'tasks': tasks
-        })
+        body = cached_response_body(team, 'team-info', {}, build_payload)
+        return HttpResponse(body, content_type='application/json')
+        
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=500)
+
+@csrf_exempt
+@require_http_methods(["POST"])
+def get_response_cache_stats(request):
+    """Počty zásahov a minutí cache odpovedí čítaní tímov (pre admina)"""
+    try:
+        data = json.loads(request.body)
+        admin_password = data.get('admin_password')
+        
+        env_admin_password = os.getenv('ADMIN_PASSWORD')
+        if not env_admin_password:
+            return JsonResponse({'error': 'Admin heslo nie je nastavené na serveri'}, status=500)
+        
+        if admin_password != env_admin_password:
+            return JsonResponse({'error': 'Nesprávne admin heslo'}, status=401)
+        
+        return JsonResponse({'success': True, 'cache': cache_stats()})
         
     except Exception as e:
         return JsonResponse({'error': str(e)}, status=500)
@@ -19,6 +19,7 @@ const TeamEditPage = () => {
   const [newTaskPeopleNeeded, setNewTaskPeopleNeeded] = useState(1);
   const [newTaskTimeSlot, setNewTaskTimeSlot] = useState(1);
   const [scheduleDate, setScheduleDate] = useState(new Date().toISOString().split('T')[0]);
+  const [scheduleDateTo, setScheduleDateTo] = useState('');
   const [importMembersText, setImportMembersText] = useState('');
   const [editingMember, setEditingMember] = useState(null);
   const [editMemberName, setEditMemberName] = useState('');
@@ -160,9 +161,19 @@ const TeamEditPage = () => {
       return;
     }
     
+    if (scheduleDateTo && scheduleDateTo < scheduleDate) {
+      setError('Dátum do musí byť po dátume od');
+      return;
+    }
+    
     setIsGeneratingSchedule(true);
     setError('');
 
+    // Rozsah dní sa generuje jednou požiadavkou
+    const dates = scheduleDateTo && scheduleDateTo !== scheduleDate
+      ? { date_from: scheduleDate, date_to: scheduleDateTo }
+      : { date: scheduleDate };
+
     try {
       const response = await fetch('/api/generate-schedule/', {
         method: 'POST',
@@ -172,7 +183,7 @@ const TeamEditPage = () => {
         body: JSON.stringify({
           team_id: teamId,
           admin_password: adminPassword,
-          date: scheduleDate
+          ...dates
         }),
       });
 
@@ -660,6 +671,18 @@ const TeamEditPage = () => {
                 />
               </div>
               
+              <div className="form-group">
+                <label htmlFor="scheduleDateTo">Do dátumu (nepovinné):</label>
+                <input
+                  id="scheduleDateTo"
+                  type="date"
+                  value={scheduleDateTo}
+                  min={scheduleDate}
+                  onChange={(e) => setScheduleDateTo(e.target.value)}
+                  className="form-input"
+                />
+              </div>
+              
               <button 
                 type="submit" 
                 className="btn btn-success"
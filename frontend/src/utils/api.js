@@ -10,6 +10,13 @@ const API_URL = isBrowser && apiUrl.includes('backend')
   ? apiUrl.replace('backend', 'localhost') 
   : apiUrl;
 
+// Team reads go out as POST by default, with the team password in the body.
+// Set REACT_APP_CACHEABLE_READS=true to send them as GET instead, so the browser
+// can revalidate them with the ETag (304 when nothing changed). Trade-off: the
+// team password then travels in the query string and can end up in proxy/access
+// logs and browser history.
+const CACHEABLE_READS = process.env.REACT_APP_CACHEABLE_READS === 'true';
+
 /**
  * Make a request to the API
  * @param {string} endpoint - The API endpoint (without the /api prefix)
@@ -53,6 +60,23 @@ export const apiRequest = async (endpoint, options = {}) => {
   }
 };
 
+/**
+ * Read team data as POST (password kept out of the URL) or GET (cacheable)
+ * @param {string} endpoint - The API endpoint
+ * @param {Object} data - Request parameters, including the team password
+ * @returns {Promise<Object>} - The response data
+ */
+const teamRead = async (endpoint, data) => {
+  if (CACHEABLE_READS) {
+    const params = new URLSearchParams(data);
+    return apiRequest(`${endpoint}?${params}`, { method: 'GET' });
+  }
+  return apiRequest(endpoint, {
+    method: 'POST',
+    body: JSON.stringify(data),
+  });
+};
+
 /**
  * Get team schedule for a specific date
  * @param {string} teamPassword - The team password
@@ -60,13 +84,7 @@ export const apiRequest = async (endpoint, options = {}) => {
  * @returns {Promise<Object>} - The schedule data
  */
 export const getTeamScheduleForDate = async (teamPassword, date) => {
-  return apiRequest('/get-schedule-for-date/', {
-    method: 'POST',
-    body: JSON.stringify({
-      team_password: teamPassword,
-      date,
-    }),
-  });
+  return teamRead('/get-schedule-for-date/', { team_password: teamPassword, date });
 };
 
 /**
@@ -76,11 +94,5 @@ export const getTeamScheduleForDate = async (teamPassword, date) => {
  * @returns {Promise<Object>} - The task data
  */
 export const getTaskDetails = async (taskId, teamPassword) => {
-  return apiRequest('/get-task-details/', {
-    method: 'POST',
-    body: JSON.stringify({
-      task_id: taskId,
-      team_password: teamPassword,
-    }),
-  });
+  return teamRead('/get-task-details/', { task_id: taskId, team_password: teamPassword });
 };